@@ -1,5 +1,5 @@
 """Database and external service connectors."""
 
-from .database import Base, get_db_session
+from .database import Base, get_async_db_session, get_db_session
 
-__all__ = ["Base", "get_db_session"]
+__all__ = ["Base", "get_async_db_session", "get_db_session"]
@@ -1,11 +1,16 @@
 """Synchronous database connector for Prefect workflows."""
 
 import os
+from uuid import uuid4
 
 from dotenv import load_dotenv
 from loguru import logger
 from sqlalchemy import MetaData, create_engine, text
+from sqlalchemy.exc import OperationalError, ProgrammingError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase, sessionmaker
+from sqlalchemy.schema import CreateIndex
+from sqlalchemy.pool import NullPool
 
 # Load environment variables
 load_dotenv()
@@ -13,6 +18,21 @@ load_dotenv()
 # Default schema for all ORM models
 DB_SCHEMA = os.getenv("DB_SCHEMA", "dev")
 
+# Connection pool sizing; kept small by default for hosted Postgres limits
+POSTGRES_POOL_SIZE = int(os.getenv("POSTGRES_POOL_SIZE", "2"))
+POSTGRES_MAX_OVERFLOW = int(os.getenv("POSTGRES_MAX_OVERFLOW", "2"))
+POSTGRES_POOL_TIMEOUT = int(os.getenv("POSTGRES_POOL_TIMEOUT", "30"))
+POSTGRES_POOL_RECYCLE = int(os.getenv("POSTGRES_POOL_RECYCLE", "1800"))
+POSTGRES_POOL_PRE_PING = os.getenv("POSTGRES_POOL_PRE_PING", "true").lower() == "true"
+
+# asyncpg prepared-statement caching saves planning on repeated simple queries
+# but can pin poor generic plans, and breaks behind transaction-pooling
+# bouncers (e.g. the Supabase pooler), where it must be disabled and prepared
+# statements given unique names.
+PGBOUNCER = os.getenv("PGBOUNCER", "false").lower() == "true"
+PG_STMT_CACHE = 0 if PGBOUNCER else int(os.getenv("PG_STMT_CACHE", "100"))
+PG_STMT_TTL = int(os.getenv("PG_STMT_TTL", "300"))
+
 
 class Base(DeclarativeBase):
     """Base class for all ORM models."""
@@ -23,6 +43,8 @@ class Base(DeclarativeBase):
 # Module-level engine (created once)
 _engine = None
 _Session = None
+_async_engine = None
+_AsyncSession = None
 
 
 def _get_engine():
@@ -37,24 +59,139 @@ def _get_engine():
         sync_url = database_url.replace("postgresql+asyncpg://", "postgresql://")
         _engine = create_engine(
             sync_url,
-            connect_args={"sslmode": "prefer", "gssencmode": "disable"},
-            pool_size=2,
-            max_overflow=2,
+            connect_args={
+                "sslmode": "prefer",
+                "gssencmode": "disable",
+                # Detect sockets dropped by NAT or load balancers while idle
+                "keepalives": 1,
+                "keepalives_idle": 60,
+                "keepalives_interval": 10,
+                "keepalives_count": 5,
+            },
+            pool_size=POSTGRES_POOL_SIZE,
+            max_overflow=POSTGRES_MAX_OVERFLOW,
+            pool_timeout=POSTGRES_POOL_TIMEOUT,
+            pool_recycle=POSTGRES_POOL_RECYCLE,
+            pool_pre_ping=POSTGRES_POOL_PRE_PING,
         )
 
         # Ensure schema and tables exist
         with _engine.begin() as conn:
             conn.execute(text(f"CREATE SCHEMA IF NOT EXISTS {DB_SCHEMA}"))
+        if not _ensure_pg_trgm(_engine):
+            _drop_trigram_indexes()
         Base.metadata.create_all(bind=_engine)
+        with _engine.begin() as conn:
+            _ensure_server_defaults(conn)
+            _ensure_indexes(conn)
 
         logger.info(f"Database engine created, schema '{DB_SCHEMA}' ensured")
 
     return _engine
 
 
+def _ensure_pg_trgm(engine) -> bool:
+    """Create the pg_trgm extension, returning False if the role may not."""
+    try:
+        with engine.begin() as conn:
+            conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+    except (ProgrammingError, OperationalError) as exc:
+        logger.warning(f"pg_trgm unavailable, skipping trigram indexes: {exc}")
+        return False
+    return True
+
+
+def _drop_trigram_indexes() -> None:
+    """Leave gin_trgm_ops indexes out of create_all when pg_trgm is missing."""
+    for table in Base.metadata.sorted_tables:
+        for index in list(table.indexes):
+            ops = index.dialect_options["postgresql"]["ops"] or {}
+            if "gin_trgm_ops" in ops.values():
+                table.indexes.discard(index)
+
+
+def _ensure_indexes(conn) -> None:
+    """Create model indexes that create_all skips on existing tables.
+
+    Trigram indexes have already been dropped from the metadata when pg_trgm
+    is unavailable, so they are skipped here too.
+    """
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            conn.execute(CreateIndex(index, if_not_exists=True))
+
+
+def _ensure_server_defaults(conn) -> None:
+    """Add server-side column defaults that create_all skips on existing tables."""
+    missing = {
+        (row.table_name, row.column_name)
+        for row in conn.execute(
+            text(
+                "SELECT table_name, column_name FROM information_schema.columns "
+                "WHERE table_schema = :schema AND column_default IS NULL"
+            ),
+            {"schema": DB_SCHEMA},
+        )
+    }
+    for table in Base.metadata.sorted_tables:
+        for column in table.columns:
+            if column.server_default is None:
+                continue
+            if (table.name, column.name) not in missing:
+                continue
+            default = column.server_default.arg.compile(
+                dialect=conn.dialect, compile_kwargs={"literal_binds": True}
+            )
+            conn.execute(
+                text(
+                    f"ALTER TABLE {table.fullname} "
+                    f"ALTER COLUMN {column.name} SET DEFAULT {default}"
+                )
+            )
+            logger.info(f"Added server default to {table.fullname}.{column.name}")
+
+
 def get_db_session():
     """Create a synchronous SQLAlchemy session."""
     global _Session
     if _Session is None:
         _Session = sessionmaker(bind=_get_engine())
     return _Session()
+
+
+def _get_async_engine():
+    global _async_engine
+    if _async_engine is None:
+        # The sync engine ensures the schema and tables exist
+        _get_engine()
+
+        database_url = os.getenv("DATABASE_URL")
+        async_url = database_url.replace("postgresql://", "postgresql+asyncpg://")
+        connect_args = {
+            "ssl": "prefer",
+            "statement_cache_size": PG_STMT_CACHE,
+            "max_cached_statement_lifetime": PG_STMT_TTL,
+            "prepared_statement_cache_size": PG_STMT_CACHE,
+        }
+        if PGBOUNCER:
+            # asyncpg still prepares every statement; unique names keep them
+            # from colliding when the bouncer hands over a server connection
+            connect_args["prepared_statement_name_func"] = (
+                lambda: f"__asyncpg_{uuid4()}__"
+            )
+        # Prefect may run async tasks on different event loops and asyncpg
+        # connections are bound to the loop that opened them, so don't pool
+        _async_engine = create_async_engine(
+            async_url, connect_args=connect_args, poolclass=NullPool
+        )
+        logger.info("Async database engine created")
+
+    return _async_engine
+
+
+def get_async_db_session() -> AsyncSession:
+    """Create an asyncio SQLAlchemy session backed by asyncpg."""
+    global _AsyncSession
+    if _AsyncSession is None:
+        _AsyncSession = async_sessionmaker(bind=_get_async_engine())
+    return _AsyncSession()
@@ -26,6 +26,7 @@ if __name__ == "__main__":
             "max_items_per_feed": 100,
             "limit_sources": 0,
             "dry_run": False,
+            "poll_interval_minutes": 30,
         },
     )
 
@@ -2,6 +2,7 @@
 """Evaluate article classification using MLflow."""
 
 import asyncio
+import os
 import sys
 from pathlib import Path
 
@@ -22,6 +23,9 @@ from mlflow.genai.scorers import scorer
 from mlflow.entities import AssessmentSource, Feedback
 from workflows.filter_attacks import classify_article
 import logging
+import nest_asyncio
+
+nest_asyncio.apply()
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
@@ -36,7 +40,28 @@ MLFLOW_GENAI_EVAL_SKIP_TRACE_VALIDATION = True
 
 import pandas as pd
 
-df = pd.read_excel("data/labeled.xlsx", sheet_name="Labeled")
+LABELED_XLSX = Path("data/labeled.xlsx")
+# Pickled copy of the "Labeled" sheet; xlsx parsing dominates script startup
+LABELED_CACHE = LABELED_XLSX.with_suffix(".pkl")
+
+
+def load_labeled() -> pd.DataFrame:
+    """Load the labeled sheet, reusing the pickle cache while it is up to date.
+
+    The cache is keyed on the workbook's exact mtime, so any change to the
+    labels (including restoring an older copy) rebuilds it.
+    """
+    source_mtime = LABELED_XLSX.stat().st_mtime_ns
+    if LABELED_CACHE.exists():
+        cached = pd.read_pickle(LABELED_CACHE)
+        if cached.get("source_mtime") == source_mtime:
+            return cached["labeled"]
+    labeled = pd.read_excel(LABELED_XLSX, sheet_name="Labeled")
+    pd.to_pickle({"source_mtime": source_mtime, "labeled": labeled}, LABELED_CACHE)
+    return labeled
+
+
+df = load_labeled()
 df.dropna(subset=["active_campaign"], inplace=True)
 
 df = df.head(20)
@@ -53,14 +78,9 @@ df_transformed = df.rename(
 )
 
 # Convert classification floats to boolean strings
-df_transformed["active_campaign"] = df_transformed["active_campaign"].apply(
-    lambda x: "True" if x == 1.0 else "False"
-)
-df_transformed["cve"] = df_transformed["cve"].apply(
-    lambda x: "True" if x == 1.0 else "False"
-)
-df_transformed["digest"] = df_transformed["digest"].apply(
-    lambda x: "True" if x == 1.0 else "False"
+label_columns = ["active_campaign", "cve", "digest"]
+df_transformed[label_columns] = (
+    df_transformed[label_columns].eq(1.0).replace({True: "True", False: "False"})
 )
 
 # Select only the columns you need
@@ -69,21 +89,20 @@ df_final = df_transformed[
 ]
 
 # Convert DataFrame to MLflow dataset format
-validation_data = []
-for _, row in df_final.iterrows():
-    validation_data.append(
-        {
-            "inputs": {
-                "article_text": row["text"],  # TODO: Need to add article text
-                "article_url": row["url"],
-            },
-            "expectations": {
-                "active_campaign": row["active_campaign"],
-                "cve": row["cve"],
-                "digest": row["digest"],
-            },
-        }
-    )
+validation_data = [
+    {
+        "inputs": {
+            "article_text": row["text"],  # TODO: Need to add article text
+            "article_url": row["url"],
+        },
+        "expectations": {
+            "active_campaign": row["active_campaign"],
+            "cve": row["cve"],
+            "digest": row["digest"],
+        },
+    }
+    for row in df_final.to_dict(orient="records")
+]
 
 dataset = create_dataset(
     name="Threat Intelligence Articles Classification Evaluation Dataset",
@@ -92,201 +111,138 @@ dataset = create_dataset(
 dataset.merge_records(validation_data)
 
 
-@scorer
-def active_campaign_accuracy(outputs: dict, expectations: dict):
-    """Score accuracy for active_campaign classification."""
-    try:
-        output_value = outputs.get("active_campaign")
-        expected_value = expectations.get("active_campaign")
+# Display names used in scorer rationales
+LABELS = {"active_campaign": "Active campaign", "cve": "CVE", "digest": "Digest"}
 
-        if output_value == expected_value:
-            return Feedback(
-                value=1.0,
-                rationale=f"Active campaign classification matches: '{output_value}' == '{expected_value}'",
-            )
-        return Feedback(
-            value=0.0,
-            rationale=f"Active campaign classification does not match: '{output_value}' != '{expected_value}'",
-        )
-    except Exception as e:
-        return Feedback(
-            value=0.0,
-            rationale=f"Exception during active_campaign scoring: {str(e)}",
-        )
-
-
-@scorer
-def cve_accuracy(outputs: dict, expectations: dict):
-    """Score accuracy for cve classification."""
-    try:
-        output_value = outputs.get("cve")
-        expected_value = expectations.get("cve")
-
-        if output_value == expected_value:
+
+def _make_accuracy(label: str):
+    """Build an accuracy scorer for a single classification label."""
+    display = LABELS[label]
+
+    def accuracy(outputs: dict, expectations: dict):
+        try:
+            output_value = outputs.get(label)
+            expected_value = expectations.get(label)
+
+            if output_value == expected_value:
+                return Feedback(
+                    value=1.0,
+                    rationale=f"{display} classification matches: "
+                    f"'{output_value}' == '{expected_value}'",
+                )
             return Feedback(
-                value=1.0,
-                rationale=f"CVE classification matches: '{output_value}' == '{expected_value}'",
+                value=0.0,
+                rationale=f"{display} classification does not match: "
+                f"'{output_value}' != '{expected_value}'",
             )
-        return Feedback(
-            value=0.0,
-            rationale=f"CVE classification does not match: '{output_value}' != '{expected_value}'",
-        )
-    except Exception as e:
-        return Feedback(
-            value=0.0,
-            rationale=f"Exception during CVE scoring: {str(e)}",
-        )
-
-
-@scorer
-def digest_accuracy(outputs: dict, expectations: dict):
-    """Score accuracy for digest classification."""
-    try:
-        output_value = outputs.get("digest")
-        expected_value = expectations.get("digest")
-
-        if output_value == expected_value:
+        except Exception as e:
             return Feedback(
-                value=1.0,
-                rationale=f"Digest classification matches: '{output_value}' == '{expected_value}'",
+                value=0.0,
+                rationale=f"Exception during {label} scoring: {str(e)}",
             )
-        return Feedback(
-            value=0.0,
-            rationale=f"Digest classification does not match: '{output_value}' != '{expected_value}'",
-        )
-    except Exception as e:
-        return Feedback(
-            value=0.0,
-            rationale=f"Exception during digest scoring: {str(e)}",
-        )
+
+    accuracy.__name__ = f"{label}_accuracy"
+    accuracy.__doc__ = f"Score accuracy for {label} classification."
+    return scorer(accuracy)
 
 
 # Precision scorers - score 1.0 for True Positives, 0.0 for False Positives, None for others
-@scorer
-def active_campaign_precision(outputs: dict, expectations: dict):
-    """Score precision for active_campaign classification."""
-    try:
-        output_value = outputs.get("active_campaign")
-        expected_value = expectations.get("active_campaign")
-
-        # True Positive
-        if output_value == "True" and expected_value == "True":
-            return Feedback(value=1.0, rationale="True Positive")
-        # False Positive
-        elif output_value == "True" and expected_value == "False":
-            return Feedback(value=0.0, rationale="False Positive")
-        # Not predicted as True, doesn't affect precision
-        else:
-            return None
-    except Exception as e:
-        return Feedback(value=0.0, rationale=f"Exception: {str(e)}")
-
-
-@scorer
-def active_campaign_recall(outputs: dict, expectations: dict):
-    """Score recall for active_campaign classification."""
-    try:
-        output_value = outputs.get("active_campaign")
-        expected_value = expectations.get("active_campaign")
-
-        # True Positive
-        if output_value == "True" and expected_value == "True":
-            return Feedback(value=1.0, rationale="True Positive")
-        # False Negative
-        elif output_value == "False" and expected_value == "True":
-            return Feedback(value=0.0, rationale="False Negative")
-        # Not actually True, doesn't affect recall
-        else:
-            return None
-    except Exception as e:
-        return Feedback(value=0.0, rationale=f"Exception: {str(e)}")
-
-
-@scorer
-def cve_precision(outputs: dict, expectations: dict):
-    """Score precision for CVE classification."""
-    try:
-        output_value = outputs.get("cve")
-        expected_value = expectations.get("cve")
-
-        # True Positive
-        if output_value == "True" and expected_value == "True":
-            return Feedback(value=1.0, rationale="True Positive")
-        # False Positive
-        elif output_value == "True" and expected_value == "False":
-            return Feedback(value=0.0, rationale="False Positive")
-        else:
-            return None
-    except Exception as e:
-        return Feedback(value=0.0, rationale=f"Exception: {str(e)}")
-
-
-@scorer
-def cve_recall(outputs: dict, expectations: dict):
-    """Score recall for CVE classification."""
-    try:
-        output_value = outputs.get("cve")
-        expected_value = expectations.get("cve")
-
-        # True Positive
-        if output_value == "True" and expected_value == "True":
-            return Feedback(value=1.0, rationale="True Positive")
-        # False Negative
-        elif output_value == "False" and expected_value == "True":
-            return Feedback(value=0.0, rationale="False Negative")
-        else:
-            return None
-    except Exception as e:
-        return Feedback(value=0.0, rationale=f"Exception: {str(e)}")
-
-
-@scorer
-def digest_precision(outputs: dict, expectations: dict):
-    """Score precision for digest classification."""
-    try:
-        output_value = outputs.get("digest")
-        expected_value = expectations.get("digest")
-
-        # True Positive
-        if output_value == "True" and expected_value == "True":
-            return Feedback(value=1.0, rationale="True Positive")
-        # False Positive
-        elif output_value == "True" and expected_value == "False":
-            return Feedback(value=0.0, rationale="False Positive")
-        else:
-            return None
-    except Exception as e:
-        return Feedback(value=0.0, rationale=f"Exception: {str(e)}")
-
-
-@scorer
-def digest_recall(outputs: dict, expectations: dict):
-    """Score recall for digest classification."""
-    try:
-        output_value = outputs.get("digest")
-        expected_value = expectations.get("digest")
-
-        # True Positive
-        if output_value == "True" and expected_value == "True":
-            return Feedback(value=1.0, rationale="True Positive")
-        # False Negative
-        elif output_value == "False" and expected_value == "True":
-            return Feedback(value=0.0, rationale="False Negative")
-        else:
-            return None
-    except Exception as e:
-        return Feedback(value=0.0, rationale=f"Exception: {str(e)}")
+def _make_precision(label: str):
+    """Build a precision scorer for a single classification label."""
+
+    def precision(outputs: dict, expectations: dict):
+        try:
+            output_value = outputs.get(label)
+            expected_value = expectations.get(label)
+
+            # True Positive
+            if output_value == "True" and expected_value == "True":
+                return Feedback(value=1.0, rationale="True Positive")
+            # False Positive
+            elif output_value == "True" and expected_value == "False":
+                return Feedback(value=0.0, rationale="False Positive")
+            # Not predicted as True, doesn't affect precision
+            else:
+                return None
+        except Exception as e:
+            return Feedback(value=0.0, rationale=f"Exception: {str(e)}")
+
+    precision.__name__ = f"{label}_precision"
+    precision.__doc__ = f"Score precision for {label} classification."
+    return scorer(precision)
+
+
+def _make_recall(label: str):
+    """Build a recall scorer for a single classification label."""
+
+    def recall(outputs: dict, expectations: dict):
+        try:
+            output_value = outputs.get(label)
+            expected_value = expectations.get(label)
+
+            # True Positive
+            if output_value == "True" and expected_value == "True":
+                return Feedback(value=1.0, rationale="True Positive")
+            # False Negative
+            elif output_value == "False" and expected_value == "True":
+                return Feedback(value=0.0, rationale="False Negative")
+            # Not actually True, doesn't affect recall
+            else:
+                return None
+        except Exception as e:
+            return Feedback(value=0.0, rationale=f"Exception: {str(e)}")
+
+    recall.__name__ = f"{label}_recall"
+    recall.__doc__ = f"Score recall for {label} classification."
+    return scorer(recall)
+
+
+scorers = [
+    make(label)
+    for label in LABELS
+    for make in (_make_accuracy, _make_precision, _make_recall)
+]
 
 
-def sync_predict_fn(article_text, article_url):
-    """Synchronous wrapper for async classify_article function."""
-    import nest_asyncio
+# Maximum number of classification requests in flight while predicting
+EVAL_CONCURRENCY = int(os.getenv("EVAL_CONCURRENCY", "16"))
+
+
+async def predict_all(records: list[dict]) -> dict[str, dict | Exception]:
+    """Classify all dataset articles concurrently, keyed by article URL.
 
-    logger.info(f"Processing article URL: {article_url}")
+    A failed article maps to its exception instead of aborting the others.
+    """
+    semaphore = asyncio.Semaphore(EVAL_CONCURRENCY)
 
-    nest_asyncio.apply()
-    loop = asyncio.get_event_loop()
-    result = loop.run_until_complete(classify_article(article_text, article_url))
+    async def predict_one(inputs: dict):
+        async with semaphore:
+            logger.info(f"Processing article URL: {inputs['article_url']}")
+            return await classify_article(inputs["article_text"], inputs["article_url"])
+
+    inputs = [record["inputs"] for record in records]
+    results = await asyncio.gather(
+        *(predict_one(i) for i in inputs), return_exceptions=True
+    )
+    return {i["article_url"]: result for i, result in zip(inputs, results)}
+
+
+predictions = asyncio.run(predict_all(validation_data))
+
+
+def sync_predict_fn(article_text, article_url):
+    """Return the precomputed classification for an article.
+
+    Articles missing from the precomputed results, or whose classification
+    failed there, are classified again here so a failure is reported per row.
+    """
+    result = predictions.get(article_url)
+    if isinstance(result, Exception):
+        logger.warning(f"Retrying article URL {article_url} after error: {result}")
+        result = None
+    if result is None:
+        logger.info(f"Processing article URL: {article_url}")
+        result = asyncio.run(classify_article(article_text, article_url))
 
     # Add URL to the output for tracking
     if isinstance(result, dict):
@@ -299,17 +255,7 @@ with mlflow.start_run(run_name="article_classification_evaluation_2"):
     results = evaluate(
         data=dataset,
         predict_fn=sync_predict_fn,
-        scorers=[
-            active_campaign_accuracy,
-            active_campaign_precision,
-            active_campaign_recall,
-            cve_accuracy,
-            cve_precision,
-            cve_recall,
-            digest_accuracy,
-            digest_precision,
-            digest_recall,
-        ],
+        scorers=scorers,
     )
 
     logger.info("\n" + "=" * 50)
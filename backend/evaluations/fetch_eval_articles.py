@@ -20,29 +20,51 @@ if __name__ == "__main__":
 import pandas as pd
 from dotenv import load_dotenv
 from loguru import logger
+from openpyxl import Workbook
+from openpyxl.utils import get_column_letter
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
 from playwright.async_api import async_playwright
 
 load_dotenv()
 
+# Only the page text is needed, so skip downloading these resource types
+BLOCKED_RESOURCE_TYPES = {"image", "media", "font", "stylesheet"}
+# Bodies shorter than this are re-read after the full page load
+MIN_CONTENT_CHARS = 200
 
-async def fetch_article_content(browser, url: str) -> dict:
+
+async def block_heavy_resources(route) -> None:
+    """Abort requests for resources that do not contribute to the page text."""
+    if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+async def fetch_article_content(page, url: str) -> dict:
     """
     Fetch article content from a single URL using Playwright.
 
     Args:
-        browser: Playwright browser instance
+        page: Playwright page borrowed from the shared page pool
         url: URL to fetch
 
     Returns:
         dict: Contains url, status_code, content, error
     """
-    page = await browser.new_page()
     try:
-        response = await page.goto(url, wait_until="networkidle", timeout=30000)
+        response = await page.goto(url, wait_until="domcontentloaded", timeout=30000)
         status_code = response.status if response else 0
 
         if status_code == 200:
             text = await page.inner_text("body")
+            if len(text) < MIN_CONTENT_CHARS:
+                # Client-rendered pages may only fill in their text on load
+                try:
+                    await page.wait_for_load_state("load", timeout=15000)
+                    text = await page.inner_text("body")
+                except PlaywrightTimeoutError:
+                    pass
             logger.info(f"[{status_code}] Fetched: {url} ({len(text)} chars)")
             return {
                 "url": url,
@@ -71,11 +93,6 @@ async def fetch_article_content(browser, url: str) -> dict:
             "error": error_msg,
             "fetched_at": datetime.now()
         }
-    finally:
-        try:
-            await page.close()
-        except Exception:
-            pass
 
 
 async def run(
@@ -105,21 +122,22 @@ async def run(
 
     logger.info(f"Loading URLs from {input_file}")
 
-    # Load URLs from Excel
-    df = pd.read_excel(input_file)
+    # Read only the header row first to locate the URL column
+    columns = pd.read_excel(input_file, nrows=0).columns
 
     # Try to find URL column (handle different possible column names)
     url_column = None
-    for col in df.columns:
+    for col in columns:
         if col.lower() in ['url', 'urls', 'link', 'links']:
             url_column = col
             break
 
     if url_column is None:
-        logger.error(f"No URL column found. Available columns: {list(df.columns)}")
+        logger.error(f"No URL column found. Available columns: {list(columns)}")
         return
 
-    # Extract URLs
+    # Load and extract URLs, parsing only the URL column
+    df = pd.read_excel(input_file, usecols=[url_column])
     urls = df[url_column].dropna().unique().tolist()
 
     if limit:
@@ -127,16 +145,37 @@ async def run(
 
     logger.info(f"Found {len(urls)} unique URLs to fetch")
 
-    # Fetch articles using Playwright
-    semaphore = asyncio.Semaphore(concurrency)
+    # Fetch articles using Playwright; one browser context with a pool of
+    # `concurrency` pages that are reused across URLs, replacing any page whose
+    # load failed
     results = []
 
     async with async_playwright() as p:
         browser = await p.chromium.launch(headless=True)
+        context = await browser.new_context()
+        await context.route("**/*", block_heavy_resources)
+        pages: asyncio.Queue = asyncio.Queue()
+        for _ in range(concurrency):
+            pages.put_nowait(await context.new_page())
 
         async def fetch_with_limit(url):
-            async with semaphore:
-                return await fetch_article_content(browser, url)
+            page = await pages.get()
+            healthy = False
+            try:
+                result = await fetch_article_content(page, url)
+                # Status 0 means navigation raised (timeout, crash, closed
+                # page), which can leave the page unusable for the next URL
+                healthy = result["status_code"] != 0 and not page.is_closed()
+                return result
+            finally:
+                if not healthy:
+                    try:
+                        if not page.is_closed():
+                            await page.close()
+                        page = await context.new_page()
+                    except Exception as e:
+                        logger.warning(f"Could not replace page: {e}")
+                pages.put_nowait(page)
 
         logger.info(f"Fetching articles (concurrency={concurrency})...")
         results = await asyncio.gather(
@@ -144,6 +183,7 @@ async def run(
             return_exceptions=True
         )
 
+        await context.close()
         await browser.close()
 
     # Process results
@@ -184,24 +224,26 @@ async def run(
     # Ensure output directory exists
     output_file.parent.mkdir(parents=True, exist_ok=True)
 
-    # Save to Excel
-    with pd.ExcelWriter(output_file, engine="openpyxl") as writer:
-        output_df.to_excel(writer, index=False, sheet_name="Articles")
-
-        # Auto-adjust column widths
-        worksheet = writer.sheets["Articles"]
-        for idx, col in enumerate(output_df.columns):
-            max_length = max(
-                output_df[col].astype(str).apply(len).max(),
-                len(str(col))
-            )
-            max_length = min(max_length + 2, 100)
-            col_letter = (
-                chr(65 + idx)
-                if idx < 26
-                else chr(65 + idx // 26 - 1) + chr(65 + idx % 26)
-            )
-            worksheet.column_dimensions[col_letter].width = max_length
+    # Save to Excel; a write-only workbook streams rows instead of
+    # materialising every cell in memory before saving
+    workbook = Workbook(write_only=True)
+    worksheet = workbook.create_sheet("Articles")
+
+    # Auto-adjust column widths (must be set before any rows are written)
+    cell_lengths = output_df.astype(str).apply(lambda s: s.str.len().max())
+    header_lengths = pd.Series(
+        [len(str(col)) for col in output_df.columns], index=output_df.columns
+    )
+    widths = (pd.concat([cell_lengths, header_lengths], axis=1).max(axis=1) + 2).clip(
+        upper=100
+    )
+    for idx, width in enumerate(widths, start=1):
+        worksheet.column_dimensions[get_column_letter(idx)].width = width
+
+    worksheet.append(list(output_df.columns))
+    for row in output_df.astype(object).itertuples(index=False, name=None):
+        worksheet.append([None if pd.isna(value) else value for value in row])
+    workbook.save(output_file)
 
     logger.info(f"Results saved to {output_file}")
     logger.info(f"  - {len(successful)} articles with content")
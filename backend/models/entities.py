@@ -9,10 +9,15 @@ from sqlalchemy import (
     BigInteger,
     Date,
     Boolean,
+    Index,
 )
 from sqlalchemy.dialects.postgresql import TIMESTAMP
+from sqlalchemy.sql import func
 from connectors import Base
 
+# Naive UTC timestamp computed by Postgres at insert time
+UTC_NOW = func.timezone("utc", func.now())
+
 
 class Article(Base):
     __tablename__ = "articles"
@@ -23,18 +28,26 @@ class Article(Base):
     url = Column(String, unique=True, nullable=False)
     http_status_code = Column(Integer, nullable=True)
     published_at = Column(DateTime, default=datetime.utcnow)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, server_default=UTC_NOW)
 
 
 class ArticleClassificationLabel(Base):
     __tablename__ = "article_classification_labels"
     id = Column(Integer, primary_key=True, index=True)
-    article_id = Column(Integer, nullable=False)
+    article_id = Column(Integer, nullable=False, index=True)
     active_campaign = Column(String, nullable=False)
     cve = Column(String, nullable=False)
     digest = Column(String, nullable=False)
     label_source = Column(String, default="manual")  # 'manual', 'llm', 'evaluation'
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, server_default=UTC_NOW)
+
+    __table_args__ = (
+        Index(
+            "ix_article_classification_labels_active_campaign_article_id",
+            "active_campaign",
+            "article_id",
+        ),
+    )
 
 
 class SourcesMasterList(Base):
@@ -52,6 +65,16 @@ class SourcesMasterList(Base):
     last_ok_status_utc_iso = Column(TIMESTAMP(timezone=True), nullable=True)
     is_active = Column(Boolean, nullable=True)
 
+    # Trigram index so dashboard ILIKE filters on source_name use an index
+    __table_args__ = (
+        Index(
+            "ix_sources_master_list_source_name_trgm",
+            "source_name",
+            postgresql_using="gin",
+            postgresql_ops={"source_name": "gin_trgm_ops"},
+        ),
+    )
+
 
 class ExtractedArticleUrl(Base):
     __tablename__ = "extracted_article_urls"
@@ -81,13 +104,46 @@ class SourceErrorLog(Base):
     created_at = Column(TIMESTAMP(timezone=True), nullable=False)
 
 
+class SourceFeedValidator(Base):
+    __tablename__ = "source_feed_validators"
+    source_uuid = Column(Text, primary_key=True, nullable=False)
+    etag = Column(Text, nullable=True)
+    last_modified = Column(Text, nullable=True)
+    updated_at = Column(TIMESTAMP(timezone=True), nullable=False)
+
+
+class RedirectCache(Base):
+    __tablename__ = "redirect_cache"
+    url_original = Column(Text, primary_key=True, nullable=False)
+    url_final = Column(Text, nullable=False)
+    resolved_at = Column(TIMESTAMP(timezone=True), nullable=False)
+
+
+class ArticleClassificationCache(Base):
+    __tablename__ = "article_classification_cache"
+    content_sha256 = Column(String, primary_key=True)
+    active_campaign = Column(String, nullable=False)
+    cve = Column(String, nullable=False)
+    digest = Column(String, nullable=False)
+    created_at = Column(DateTime, server_default=UTC_NOW)
+
+
+class ArticleSummaryCache(Base):
+    __tablename__ = "article_summary_cache"
+    content_sha256 = Column(String, primary_key=True)
+    prompt_version = Column(Integer, nullable=False)
+    model = Column(String, nullable=False)
+    summary = Column(Text, nullable=False)
+    created_at = Column(DateTime, server_default=UTC_NOW)
+
+
 class Cluster(Base):
     __tablename__ = "clusters"
     id = Column(Integer, primary_key=True, autoincrement=True)
     campaign_name = Column(String, nullable=False)
     reasoning = Column(Text, nullable=True)
     run_id = Column(String, nullable=True, index=True)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, server_default=UTC_NOW)
 
 
 class ClusterArticle(Base):
@@ -95,4 +151,4 @@ class ClusterArticle(Base):
     id = Column(Integer, primary_key=True, autoincrement=True)
     cluster_id = Column(Integer, nullable=False, index=True)
     article_url = Column(Text, nullable=False)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, server_default=UTC_NOW)
@@ -57,6 +57,17 @@ class ArticleClassification(BaseModel):
     )
 
 
+class ArticleClassificationItem(ArticleClassification):
+    article_id: int = Field(
+        description="Id of the article this classification belongs to"
+    )
+
+
+class ArticleSummaryItem(BaseModel):
+    article_id: int = Field(description="Index of the article this summary belongs to")
+    summary: str = Field(description="Summary of the article")
+
+
 class ArticleCluster(BaseModel):
     campaign_name: str = Field(description="Name of the cluster/campaign")
     article_urls: list[str] = Field(
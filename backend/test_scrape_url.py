@@ -1,10 +1,37 @@
-"""Quick manual test for _do_scrape. Run with: uv run test_scrape_url.py"""
+"""Quick manual test for _do_scrape. Run with: uv run test_scrape_url.py
 
-from workflows.get_link_content import _do_scrape
+Scraped text is cached on disk by URL for a day so repeated runs skip the
+browser. Pass --refresh to force a new scrape.
+"""
+
+import asyncio
+import shelve
+import sys
+import time
+
+from workflows.get_link_content import _browser_context, _do_scrape
 
 url = "https://phys.org/news/2026-02-elusive-lithium-ion-anode-binder.html"
 
-text = _do_scrape(url)
+CACHE_PATH = ".scrape_cache"
+CACHE_TTL_SECONDS = 86_400
+
+
+async def scrape(url: str) -> str:
+    async with _browser_context() as context:
+        return await _do_scrape(context, url)
+
+
+with shelve.open(CACHE_PATH) as cache:
+    cached = cache.get(url)
+    fresh = cached is not None and time.time() - cached[0] < CACHE_TTL_SECONDS
+    if fresh and "--refresh" not in sys.argv:
+        text = cached[1]
+        print("(cached)")
+    else:
+        text = asyncio.run(scrape(url))
+        cache[url] = (time.time(), text)
+
 print(f"URL: {url}")
 print(f"Text length: {len(text)} chars")
 print(f"\n--- First 1000 chars ---\n{text[:1000]}")
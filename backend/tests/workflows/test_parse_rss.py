@@ -0,0 +1,218 @@
+"""Compare the fast feed parsers in parse_rss against feedparser."""
+
+import json
+
+import feedparser
+import pytest
+
+from workflows.parse_rss import _fast_parse, _parse_json_feed, parse_feed
+
+FIELDS = ("link", "id", "title", "published", "updated")
+
+RSS_20 = b"""<?xml version="1.0" encoding="utf-8"?>
+<rss version="2.0">
+  <channel>
+    <title>Example</title>
+    <link>https://example.com/</link>
+    <item>
+      <title>First article</title>
+      <link>https://example.com/first</link>
+      <guid>https://example.com/first</guid>
+      <pubDate>Fri, 02 Jan 2026 03:04:05 GMT</pubDate>
+    </item>
+    <item>
+      <title>Second article</title>
+      <link>https://example.com/second</link>
+      <pubDate>Sat, 03 Jan 2026 10:00:00 +0100</pubDate>
+    </item>
+  </channel>
+</rss>
+"""
+
+ATOM_10 = b"""<?xml version="1.0" encoding="utf-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom">
+  <title>Example</title>
+  <id>urn:example:feed</id>
+  <updated>2026-01-03T03:04:05Z</updated>
+  <entry>
+    <title>First entry</title>
+    <link rel="self" href="https://example.com/first.atom"/>
+    <link href="https://example.com/first"/>
+    <id>urn:example:1</id>
+    <published>2026-01-02T03:04:05Z</published>
+    <updated>2026-01-03T03:04:05Z</updated>
+  </entry>
+  <entry>
+    <title>Second entry</title>
+    <link rel="alternate" href="https://example.com/second"/>
+    <id>urn:example:2</id>
+    <updated>2026-01-04T00:00:00Z</updated>
+  </entry>
+</feed>
+"""
+
+# Extension elements come first so they would win a local-name match
+RSS_NAMESPACED = b"""<?xml version="1.0" encoding="utf-8"?>
+<rss version="2.0"
+     xmlns:atom="http://www.w3.org/2005/Atom"
+     xmlns:dc="http://purl.org/dc/elements/1.1/"
+     xmlns:itunes="http://www.itunes.com/dtds/podcast-1.0.dtd"
+     xmlns:media="http://search.yahoo.com/mrss/">
+  <channel>
+    <title>Example</title>
+    <atom:link href="https://example.com/feed.xml" rel="self"/>
+    <item>
+      <media:title>Media T</media:title>
+      <itunes:title>Episode title</itunes:title>
+      <title>Real title</title>
+      <atom:link href="https://example.com/other" rel="alternate"/>
+      <link>https://example.com/real</link>
+      <guid isPermaLink="false">item-1</guid>
+      <dc:date>2026-01-02T03:04:05Z</dc:date>
+    </item>
+  </channel>
+</rss>
+"""
+
+ATOM_NAMESPACED = b"""<?xml version="1.0" encoding="utf-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom"
+      xmlns:media="http://search.yahoo.com/mrss/">
+  <title>Example</title>
+  <id>urn:example:feed</id>
+  <entry>
+    <media:title>Media T</media:title>
+    <title>Real entry</title>
+    <link href="https://example.com/real"/>
+    <id>urn:example:1</id>
+    <published>2026-01-02T03:04:05Z</published>
+  </entry>
+</feed>
+"""
+
+RSS_10 = b"""<?xml version="1.0" encoding="utf-8"?>
+<rdf:RDF xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#"
+         xmlns="http://purl.org/rss/1.0/"
+         xmlns:dc="http://purl.org/dc/elements/1.1/">
+  <channel rdf:about="https://example.com/">
+    <title>Example</title>
+    <link>https://example.com/</link>
+  </channel>
+  <item rdf:about="https://example.com/first">
+    <title>First article</title>
+    <link>https://example.com/first</link>
+    <dc:date>2026-01-02T03:04:05Z</dc:date>
+  </item>
+</rdf:RDF>
+"""
+
+
+# Relative links resolve against xml:base, which only feedparser handles
+ATOM_XML_BASE = b"""<?xml version="1.0" encoding="utf-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom" xml:base="https://example.com/">
+  <title>Example</title>
+  <id>urn:example:feed</id>
+  <entry>
+    <title>First entry</title>
+    <link href="/first"/>
+    <id>urn:example:1</id>
+    <updated>2026-01-03T03:04:05Z</updated>
+  </entry>
+  <entry xml:base="https://example.com/news/">
+    <title>Second entry</title>
+    <link href="second"/>
+    <id>urn:example:2</id>
+    <updated>2026-01-04T00:00:00Z</updated>
+  </entry>
+</feed>
+"""
+
+
+def _feedparser_entries(content: bytes) -> list[dict]:
+    return [
+        {key: entry[key] for key in FIELDS if key in entry}
+        for entry in feedparser.parse(content).entries
+    ]
+
+
+@pytest.mark.parametrize(
+    "content",
+    [RSS_20, ATOM_10, RSS_NAMESPACED, ATOM_NAMESPACED],
+    ids=["rss20", "atom10", "rss-namespaced", "atom-namespaced"],
+)
+def test_fast_parse_matches_feedparser(content):
+    assert _fast_parse(content) == _feedparser_entries(content)
+
+
+def test_fast_parse_ignores_extension_titles():
+    (entry,) = _fast_parse(RSS_NAMESPACED)
+    assert entry["title"] == "Real title"
+    assert entry["link"] == "https://example.com/real"
+
+
+def test_fast_parse_leaves_other_roots_to_feedparser():
+    assert _fast_parse(RSS_10) is None
+    entries, error = parse_feed(RSS_10)
+    assert error == ""
+    assert [entry["link"] for entry in entries] == ["https://example.com/first"]
+
+
+def test_parse_feed_resolves_relative_links_like_feedparser():
+    assert _fast_parse(ATOM_XML_BASE) is None
+    entries, error = parse_feed(ATOM_XML_BASE)
+    assert error == ""
+    assert [
+        {key: entry[key] for key in FIELDS if key in entry} for entry in entries
+    ] == _feedparser_entries(ATOM_XML_BASE)
+    assert [entry["link"] for entry in entries] == [
+        "https://example.com/first",
+        "https://example.com/news/second",
+    ]
+
+
+def test_parse_json_feed_matches_feedparser_on_atom_equivalent():
+    # feedparser does not read JSON Feed, so compare against the same items
+    # published as Atom
+    json_feed = json.dumps(
+        {
+            "version": "https://jsonfeed.org/version/1.1",
+            "title": "Example",
+            "items": [
+                {
+                    "id": "urn:example:1",
+                    "url": "https://example.com/first",
+                    "title": "First entry",
+                    "date_published": "2026-01-02T03:04:05Z",
+                    "date_modified": "2026-01-03T03:04:05Z",
+                },
+                {
+                    "id": "urn:example:2",
+                    "url": "https://example.com/second",
+                    "title": "Second entry",
+                    "date_published": "2026-01-04T00:00:00Z",
+                    "date_modified": "2026-01-04T00:00:00Z",
+                },
+            ],
+        }
+    ).encode()
+    atom = b"""<?xml version="1.0" encoding="utf-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom">
+  <title>Example</title>
+  <id>urn:example:feed</id>
+  <entry>
+    <title>First entry</title>
+    <link href="https://example.com/first"/>
+    <id>urn:example:1</id>
+    <published>2026-01-02T03:04:05Z</published>
+    <updated>2026-01-03T03:04:05Z</updated>
+  </entry>
+  <entry>
+    <title>Second entry</title>
+    <link href="https://example.com/second"/>
+    <id>urn:example:2</id>
+    <published>2026-01-04T00:00:00Z</published>
+    <updated>2026-01-04T00:00:00Z</updated>
+  </entry>
+</feed>
+"""
+    assert _parse_json_feed(json_feed) == _feedparser_entries(atom)
+    assert parse_feed(json_feed) == (_feedparser_entries(atom), "")
@@ -2,95 +2,286 @@
 
 from __future__ import annotations
 
-import json
+import hashlib
 import os
+from collections import defaultdict
+from functools import lru_cache
 
+import httpx
 from dotenv import load_dotenv
 from google import genai
-from google.genai import types
+from google.genai import errors, types
 from prefect import flow, get_run_logger, runtime, task
+from prefect.concurrency.sync import rate_limit
+from prefect.futures import as_completed
+from pydantic import TypeAdapter
+from sqlalchemy import insert, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from tenacity import (
+    retry,
+    retry_if_exception,
+    stop_after_attempt,
+    wait_exponential_jitter,
+)
 
 from connectors import get_db_session
-from models.entities import Article, ArticleClassificationLabel, Cluster, ClusterArticle
-from models.schemas import ArticleCluster, ClusteringResult
+from models.entities import (
+    Article,
+    ArticleClassificationLabel,
+    ArticleSummaryCache,
+    Cluster,
+    ClusterArticle,
+)
+from models.schemas import ArticleCluster, ArticleSummaryItem, ClusteringResult
 from prompts.article_summary import SUMMARY_1, SUMMARY_2
 from prompts.clustering import CLUSTERING
 
-load_dotenv()
+FLOW_NAME = "cluster-articles"
+LLM_MODEL = "gemini-2.5-pro"
+# Global concurrency limit with slot decay that paces Gemini requests, e.g.
+# `prefect gcl create gemini-requests --limit 60 --slot-decay-per-second 1`
+LLM_RATE_LIMIT = "gemini-requests"
+CACHE_LOOKUP_CHUNK_SIZE = 1000
+# Article bodies per summarisation request; larger batches trade summary
+# quality for throughput under the request rate limit.
+SUMMARY_BATCH_SIZE = 4
+# Output caps include thinking tokens, which gemini-2.5-pro cannot switch off
+SUMMARY_MAX_OUTPUT_TOKENS = 4096
+SUMMARY_THINKING_BUDGET = 1024
+# Clustering output grows with the input: at worst every article is its own
+# cluster with a name and reasoning, capped at the model's output limit
+CLUSTERING_THINKING_BUDGET = 8192
+CLUSTERING_BASE_OUTPUT_TOKENS = 256
+CLUSTERING_TOKENS_PER_ARTICLE = 100
+CLUSTERING_MAX_OUTPUT_TOKENS = 65536
+LLM_TIMEOUT_MS = 120_000
+CLUSTERING_TIMEOUT_MS = 600_000
+# Validates a batch summary response straight from JSON text in one pass
+SUMMARY_ITEMS = TypeAdapter(list[ArticleSummaryItem])
+
+
+@lru_cache(maxsize=1)
+def _client() -> genai.Client:
+    """Create the client lazily so importing the flow needs no API key."""
+    load_dotenv()
+    return genai.Client(
+        api_key=os.getenv("API_KEY"),
+        http_options=types.HttpOptions(timeout=LLM_TIMEOUT_MS),
+    )
 
-client = genai.Client(api_key=os.getenv("API_KEY"))
 
-FLOW_NAME = "cluster-articles"
+def _summary_key(article_text: str, prompt_version: int) -> str:
+    """Key a summary on model, system prompt and whitespace-normalised body.
 
+    The URL is deliberately left out so the same body published under a
+    different URL (or re-run later) reuses the stored summary.
+    """
+    system_instruction = SUMMARY_1 if prompt_version == 1 else SUMMARY_2
+    normalized = " ".join(article_text.split())
+    payload = "\x1f".join((LLM_MODEL, system_instruction, normalized))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
 
-# --- Prefect Tasks ---
 
+# --- LLM Helpers ---
 
-@task(name="load-articles-for-clustering", tags=["clustering-io"])
-def load_articles() -> list[dict]:
-    """Load active campaign articles from the database."""
-    logger = get_run_logger()
 
-    session = get_db_session()
-    try:
-        rows = (
-            session.query(Article.url, Article.cleaned_text)
-            .join(
-                ArticleClassificationLabel,
-                Article.id == ArticleClassificationLabel.article_id,
-            )
-            .filter(ArticleClassificationLabel.active_campaign == "True")
-            .all()
-        )
-    finally:
-        session.close()
+def _is_transient_llm_error(exc: BaseException) -> bool:
+    """Rate limiting, server and transport errors are retried, as are
+    responses that fail to parse (ValueError covers truncated JSON and schema
+    validation); other 4xx fail fast."""
+    if isinstance(exc, errors.ClientError):
+        return exc.code == 429
+    return isinstance(exc, (errors.ServerError, httpx.TransportError, ValueError))
 
-    if not rows:
-        logger.warning("No active campaign articles found in database")
-        return []
 
-    logger.info("Loaded %d active campaign articles from database", len(rows))
-    return [{"url": row.url, "cleaned_text": row.cleaned_text or ""} for row in rows]
+# Wraps a whole request-and-parse step so a malformed response is re-requested
+_llm_retry = retry(
+    retry=retry_if_exception(_is_transient_llm_error),
+    wait=wait_exponential_jitter(initial=1, max=30),
+    stop=stop_after_attempt(5),
+    reraise=True,
+)
 
 
-@task(name="summarize-article", tags=["LLM_CALLS"], retries=3, retry_delay_seconds=2)
-def summarize_article(
-    article_text: str, article_url: str, prompt_version: int = 1
-) -> str:
-    """Generate a summary of an article optimised for clustering."""
-    logger = get_run_logger()
+def _generate_content(**kwargs) -> types.GenerateContentResponse:
+    rate_limit(LLM_RATE_LIMIT)
+    return _client().models.generate_content(model=LLM_MODEL, **kwargs)
+
+
+@_llm_retry
+def _summarize_batch(article_texts: list[str], prompt_version: int) -> list[str]:
     system_instruction = SUMMARY_1 if prompt_version == 1 else SUMMARY_2
 
-    response = client.models.generate_content(
-        model="gemini-2.5-pro",
-        contents=article_text,
-        config=types.GenerateContentConfig(system_instruction=system_instruction),
+    contents = (
+        f"Summarise each of the {len(article_texts)} articles below independently. "
+        "Return a JSON array with exactly one summary per article, carrying the "
+        "article's [index] as article_id.\n\n"
+        + "\n---\n".join(f"[{idx}] {text}" for idx, text in enumerate(article_texts))
     )
-    logger.info("Summary generated for article: %s", article_url)
-    return response.text.strip()
 
+    response = _generate_content(
+        contents=contents,
+        config=types.GenerateContentConfig(
+            response_mime_type="application/json",
+            response_schema=list[ArticleSummaryItem],
+            system_instruction=system_instruction,
+            max_output_tokens=SUMMARY_MAX_OUTPUT_TOKENS,
+            thinking_config=types.ThinkingConfig(
+                thinking_budget=SUMMARY_THINKING_BUDGET
+            ),
+        ),
+    )
+    items = response.parsed
+    if not isinstance(items, list):
+        items = SUMMARY_ITEMS.validate_json(response.text or "")
+
+    # Reordered, merged or split summaries would be cached under the wrong key
+    by_idx = {item.article_id: item.summary for item in items}
+    if len(items) != len(article_texts) or set(by_idx) != set(
+        range(len(article_texts))
+    ):
+        raise ValueError(
+            f"Expected summaries for indices 0-{len(article_texts) - 1}, "
+            f"got {sorted(by_idx)}"
+        )
+    return [by_idx[idx].strip() for idx in range(len(article_texts))]
 
-@task(name="cluster-articles", tags=["LLM_CALLS"], retries=3, retry_delay_seconds=2)
-def cluster_articles(article_summaries: list[dict]) -> ClusteringResult:
-    """Cluster articles by campaign using LLM structured output."""
-    logger = get_run_logger()
 
+@_llm_retry
+def _cluster(article_summaries: list[dict]) -> ClusteringResult:
     summaries_text = "\n\n".join(
         f"[{idx}]\nURL: {item['url']}\nSUMMARY: {item['summary']}"
         for idx, item in enumerate(article_summaries)
     )
 
-    response = client.models.generate_content(
-        model="gemini-2.5-pro",
+    max_output_tokens = min(
+        CLUSTERING_THINKING_BUDGET
+        + CLUSTERING_BASE_OUTPUT_TOKENS
+        + CLUSTERING_TOKENS_PER_ARTICLE * len(article_summaries),
+        CLUSTERING_MAX_OUTPUT_TOKENS,
+    )
+
+    response = _generate_content(
         contents=summaries_text,
         config=types.GenerateContentConfig(
             response_mime_type="application/json",
             response_schema=ClusteringResult,
             system_instruction=CLUSTERING,
+            max_output_tokens=max_output_tokens,
+            thinking_config=types.ThinkingConfig(
+                thinking_budget=CLUSTERING_THINKING_BUDGET
+            ),
+            # One call covers every summary, so allow longer than the default
+            http_options=types.HttpOptions(timeout=CLUSTERING_TIMEOUT_MS),
         ),
     )
+    if isinstance(response.parsed, ClusteringResult):
+        return response.parsed
+    return ClusteringResult.model_validate_json(response.text or "")
+
+
+# --- Prefect Tasks ---
+
+
+@task(name="load-articles-for-clustering", tags=["clustering-io"])
+def load_articles() -> list[dict]:
+    """Load active campaign articles from the database."""
+    logger = get_run_logger()
+
+    stmt = (
+        select(Article.url, Article.cleaned_text)
+        .join(
+            ArticleClassificationLabel,
+            Article.id == ArticleClassificationLabel.article_id,
+        )
+        .where(ArticleClassificationLabel.active_campaign == "True")
+        .order_by(Article.id)
+        .execution_options(yield_per=500)
+    )
+
+    session = get_db_session()
+    try:
+        # Stream rows from a server-side cursor straight into the output dicts
+        articles = [
+            {"url": row.url, "cleaned_text": row.cleaned_text or ""}
+            for row in session.execute(stmt)
+        ]
+    finally:
+        session.close()
+
+    if not articles:
+        logger.warning("No active campaign articles found in database")
+        return []
+
+    logger.info("Loaded %d active campaign articles from database", len(articles))
+    return articles
+
+
+@task(name="load-cached-summaries", tags=["clustering-io"])
+def load_cached_summaries(keys: list[str]) -> dict[str, str]:
+    """Return previously generated summaries for the given summary keys."""
+    logger = get_run_logger()
+
+    session = get_db_session()
+    try:
+        cached: dict[str, str] = {}
+        for start in range(0, len(keys), CACHE_LOOKUP_CHUNK_SIZE):
+            chunk = keys[start : start + CACHE_LOOKUP_CHUNK_SIZE]
+            rows = session.execute(
+                select(
+                    ArticleSummaryCache.content_sha256, ArticleSummaryCache.summary
+                ).where(ArticleSummaryCache.content_sha256.in_(chunk))
+            )
+            cached.update(rows.tuples())
+    finally:
+        session.close()
+
+    logger.info("Found %d/%d summaries in cache", len(cached), len(keys))
+    return cached
+
+
+@task(name="save-cached-summaries", tags=["clustering-io"])
+def save_cached_summaries(entries: list[dict]) -> None:
+    """Store newly generated summaries so later runs can reuse them."""
+    logger = get_run_logger()
+
+    session = get_db_session()
+    try:
+        session.execute(
+            pg_insert(ArticleSummaryCache)
+            .values(entries)
+            .on_conflict_do_nothing(index_elements=[ArticleSummaryCache.content_sha256])
+        )
+        session.commit()
+        logger.info("Cached %d new summaries", len(entries))
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.close()
+
+
+@task(name="summarize-article-batch", tags=["LLM_CALLS"])
+def summarize_article_batch(
+    article_texts: list[str], article_urls: list[str], prompt_version: int = 1
+) -> list[str]:
+    """Generate clustering summaries for several articles in one LLM call.
+
+    Summaries are returned in the same order as the input articles.
+    """
+    logger = get_run_logger()
+    summaries = _summarize_batch(article_texts, prompt_version)
+    logger.info("Summaries generated for articles: %s", ", ".join(article_urls))
+    return summaries
+
+
+@task(name="cluster-articles", tags=["LLM_CALLS"])
+def cluster_articles(article_summaries: list[dict]) -> ClusteringResult:
+    """Cluster articles by campaign using LLM structured output."""
+    logger = get_run_logger()
+    result = _cluster(article_summaries)
     logger.info("Clustering completed successfully")
-    return ClusteringResult(**json.loads(response.text))
+    return result
 
 
 @task(name="save-cluster-to-db", tags=["clustering-io"])
@@ -108,8 +299,14 @@ def save_cluster_to_db(cluster_data: ArticleCluster, run_id: str | None = None)
         session.add(cluster)
         session.flush()
 
-        for url in cluster_data.article_urls:
-            session.add(ClusterArticle(cluster_id=cluster.id, article_url=url))
+        if cluster_data.article_urls:
+            session.execute(
+                insert(ClusterArticle),
+                [
+                    {"cluster_id": cluster.id, "article_url": url}
+                    for url in cluster_data.article_urls
+                ],
+            )
 
         session.commit()
         logger.info(
@@ -134,7 +331,8 @@ def run(prompt_version: int = 1, limit: int | None = None) -> None:
     """Summarize and cluster active campaign articles from the database.
 
     Concurrency for LLM calls is controlled by Prefect concurrency limits on the
-    'LLM_CALLS' tag (configure in the Prefect UI or via CLI).
+    'LLM_CALLS' tag (configure in the Prefect UI or via CLI). Request rate is
+    paced by the 'gemini-requests' global concurrency limit when it exists.
     """
     logger = get_run_logger()
     flow_run_id = str(runtime.flow_run.id) if runtime.flow_run.id else None
@@ -147,27 +345,76 @@ def run(prompt_version: int = 1, limit: int | None = None) -> None:
         logger.warning("No articles to cluster; exiting")
         return
 
-    # Submit all summarisation tasks; Prefect concurrency limits on LLM_CALLS
-    # tag control actual parallelism without manual batching.
-    futures = [
-        (
-            article,
-            summarize_article.submit(
-                article["cleaned_text"], article["url"], prompt_version
-            ),
-        )
-        for article in articles
+    # Syndicated articles often share an identical body; summarise each
+    # distinct body once and reuse the summary for every URL that carries it.
+    article_keys = [
+        _summary_key(article["cleaned_text"], prompt_version) for article in articles
     ]
+    groups: dict[str, list[dict]] = defaultdict(list)
+    for key, article in zip(article_keys, articles):
+        groups[key].append(article)
+
+    # Bodies summarised by earlier runs are served from the summary cache
+    summaries = load_cached_summaries(list(groups))
+    pending = [key for key in groups if key not in summaries]
+    logger.info(
+        "Summarising %d distinct article bodies for %d articles (%d cached)",
+        len(pending),
+        len(articles),
+        len(summaries),
+    )
 
-    article_summaries: list[dict] = []
+    # Several bodies share each request so the rate limit covers more articles;
+    # Prefect concurrency limits on LLM_CALLS tag control actual parallelism.
+    batches = [
+        pending[start : start + SUMMARY_BATCH_SIZE]
+        for start in range(0, len(pending), SUMMARY_BATCH_SIZE)
+    ]
+    futures = {
+        summarize_article_batch.submit(
+            [groups[key][0]["cleaned_text"] for key in batch],
+            [groups[key][0]["url"] for key in batch],
+            prompt_version,
+        ): batch
+        for batch in batches
+    }
+
+    # Collect summaries as they finish so failures are logged without waiting
+    # on stragglers submitted earlier.
+    new_entries: list[dict] = []
     failed_count = 0
-    for article, future in futures:
+    for future in as_completed(list(futures)):
+        batch = futures[future]
         result = future.result(raise_on_failure=False)
         if isinstance(result, Exception):
-            logger.error("Failed to summarise %s: %s", article["url"], result)
-            failed_count += 1
-        else:
-            article_summaries.append({"url": article["url"], "summary": result})
+            logger.error(
+                "Failed to summarise %s: %s",
+                ", ".join(groups[key][0]["url"] for key in batch),
+                result,
+            )
+            failed_count += sum(len(groups[key]) for key in batch)
+            continue
+        for key, summary in zip(batch, result):
+            summaries[key] = summary
+            new_entries.append(
+                {
+                    "content_sha256": key,
+                    "prompt_version": prompt_version,
+                    "model": LLM_MODEL,
+                    "summary": summary,
+                }
+            )
+
+    if new_entries:
+        save_cached_summaries(new_entries)
+
+    # Rebuild in load order (article id) so the clustering prompt is stable
+    # across runs over the same articles
+    article_summaries = [
+        {"url": article["url"], "summary": summaries[key]}
+        for key, article in zip(article_keys, articles)
+        if key in summaries
+    ]
 
     logger.info(
         "Summarisation done: %d/%d succeeded, %d failed",
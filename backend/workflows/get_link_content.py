@@ -2,12 +2,17 @@
 
 from __future__ import annotations
 
+import asyncio
 import json
-import time
+import os
 from collections import defaultdict
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 from datetime import datetime, timezone
 
-from playwright.sync_api import sync_playwright
+import aiohttp
+from bs4 import BeautifulSoup
+from playwright.async_api import BrowserContext, Route, async_playwright
 from prefect import flow, get_run_logger, task
 from sqlalchemy import select
 from sqlalchemy.dialects.postgresql import insert
@@ -15,26 +20,56 @@ from sqlalchemy.dialects.postgresql import insert
 from connectors.database import get_db_session
 from models.entities import Article, ExtractedArticleUrl, SourceErrorLog
 
+# Per-source politeness: concurrent page loads and spacing between their starts
+SCRAPE_CONCURRENCY = 4
+SCRAPE_MIN_INTERVAL_SECONDS = 1.0
+# Plain HTTP fast path; pages yielding less text than this go to the browser
+USER_AGENT = "threat-intel/0.1 (+https://localhost)"
+HTTP_TIMEOUT_SECONDS = 15
+MIN_HTTP_TEXT_CHARS = 500
+# Upper bound on one browser scrape, so a hung page cannot stall its source
+SCRAPE_PAGE_TIMEOUT_SECONDS = 45
+# Only the page text is needed, so the browser skips downloading these
+BLOCKED_RESOURCE_TYPES = {"image", "media", "font", "stylesheet"}
+# In-page extraction: prefer the main content element over the full body
+EXTRACT_TEXT_JS = """() => {
+    const root = document.querySelector("article")
+        || document.querySelector("main")
+        || document.body;
+    return root ? root.innerText.trim() : "";
+}"""
+
 
 # --- Utility functions (pure) ---
 
 
-def common_prefix_length(*lists) -> int:
-    if not lists:
-        return 0
-    for i, values in enumerate(zip(*lists)):
-        if len(set(values)) != 1:
-            return i
-    return min(len(lst) for lst in lists)
+def _snap_to_word(common: str) -> int:
+    """Length of `common` cut back to just after its last space."""
+    return common.rfind(" ") + 1
+
+
+def common_affixes(texts: list[str]) -> tuple[int, int]:
+    """Return the character lengths of the prefix and suffix shared by all texts.
 
+    Both are cut back to whole space-separated words. Fewer than two texts
+    have no shared boilerplate to detect, so nothing is trimmed. The suffix
+    is clipped so prefix and suffix never overlap.
+    """
+    if len(texts) < 2:
+        return 0, 0
+    prefix = _snap_to_word(os.path.commonprefix(texts))
+    suffix = _snap_to_word(os.path.commonprefix([text[::-1] for text in texts]))
+    shortest = min(len(text) for text in texts)
+    return prefix, min(suffix, shortest - prefix)
 
-def common_suffix_length(*lists) -> int:
-    if not lists:
-        return 0
-    for i, values in enumerate(zip(*(reversed(lst) for lst in lists))):
-        if len(set(values)) != 1:
-            return i
-    return min(len(lst) for lst in lists)
+
+def html_to_text(html: str) -> str:
+    """Extract the visible text of the article, main or body element."""
+    soup = BeautifulSoup(html, "html.parser")
+    for tag in soup(["script", "style", "noscript", "template"]):
+        tag.decompose()
+    root = soup.find("article") or soup.find("main") or soup.body or soup
+    return root.get_text("\n", strip=True)
 
 
 # --- Prefect Tasks ---
@@ -44,75 +79,172 @@ def common_suffix_length(*lists) -> int:
 def fetch_new_rss_items(limit: int = 0) -> list[dict]:
     """Load extracted article URLs that have no matching Article record yet."""
     logger = get_run_logger()
+
+    # Anti-join in Postgres so only URLs without an Article cross the wire
+    stmt = (
+        select(
+            ExtractedArticleUrl.article_url_final,
+            ExtractedArticleUrl.source_url,
+            ExtractedArticleUrl.source_uuid,
+            ExtractedArticleUrl.article_uuid,
+        )
+        .outerjoin(Article, Article.url == ExtractedArticleUrl.article_url_final)
+        .where(
+            Article.url.is_(None),
+            ExtractedArticleUrl.article_url_final.is_not(None),
+        )
+    )
+    if limit > 0:
+        stmt = stmt.limit(limit)
+
     session = get_db_session()
     try:
-        extracted = list(session.execute(select(ExtractedArticleUrl)).scalars().all())
-        existing_urls: set[str] = {
-            row[0] for row in session.execute(select(Article.url)).all()
-        }
         new_items = [
             {
-                "url": item.article_url_final,
-                "source_name": item.source_url,
-                "source_uuid": item.source_uuid,
-                "article_uuid": item.article_uuid,
+                "url": row.article_url_final,
+                "source_name": row.source_url,
+                "source_uuid": row.source_uuid,
+                "article_uuid": row.article_uuid,
             }
-            for item in extracted
-            if item.article_url_final and item.article_url_final not in existing_urls
+            for row in session.execute(stmt)
         ]
-        if limit > 0:
-            new_items = new_items[:limit]
-        logger.info(
-            "Extracted total=%d existing=%d new=%d limit=%s",
-            len(extracted),
-            len(existing_urls),
-            len(new_items),
-            limit or "none",
-        )
-        return new_items
     finally:
         session.close()
 
+    logger.info("Extracted new=%d limit=%s", len(new_items), limit or "none")
+    return new_items
+
+
+async def _block_heavy_resources(route: Route) -> None:
+    """Abort requests for resources that do not contribute to the page text."""
+    if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+        await route.abort()
+    else:
+        await route.continue_()
 
-def _do_scrape(url: str) -> str:
-    """Launch a headless browser and return the page body text."""
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
-        page = browser.new_page()
+
+@asynccontextmanager
+async def _browser_context() -> AsyncIterator[BrowserContext]:
+    """Launch one headless browser and yield a context shared by many pages."""
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True)
         try:
-            page.goto(url, wait_until="domcontentloaded", timeout=30_000)
-            return page.inner_text("body")
+            context = await browser.new_context()
+            await context.route("**/*", _block_heavy_resources)
+            yield context
+            await context.close()
         finally:
-            page.close()
-            browser.close()
+            await browser.close()
+
+
+async def _fetch_http(session: aiohttp.ClientSession, url: str) -> str | None:
+    """Fetch a server-rendered page without a browser.
+
+    Returns None when the response is not usable HTML or carries too little
+    text, in which case the caller falls back to Playwright.
+    """
+    try:
+        async with session.get(url, allow_redirects=True) as response:
+            content_type = response.headers.get("Content-Type", "").lower()
+            if response.status != 200 or "html" not in content_type:
+                return None
+            html = await response.text(errors="replace")
+    except (aiohttp.ClientError, asyncio.TimeoutError):
+        return None
+
+    text = await asyncio.to_thread(html_to_text, html)
+    return text if len(text) >= MIN_HTTP_TEXT_CHARS else None
+
+
+async def _do_scrape(context: BrowserContext, url: str) -> str:
+    """Open the URL in a new page of the shared context and return its main text."""
+    page = await context.new_page()
+    try:
+        await page.goto(url, wait_until="domcontentloaded", timeout=30_000)
+        return await page.evaluate(EXTRACT_TEXT_JS)
+    finally:
+        await page.close()
 
 
 @task(name="scrape-source-urls", tags=["scraping"])
-def scrape_source_urls(items: list[dict]) -> tuple[list[dict], list[dict]]:
-    """Scrape all URLs for one source sequentially with a 5 s fixed delay between requests."""
+async def scrape_source_urls(items: list[dict]) -> tuple[list[dict], list[dict]]:
+    """Scrape all URLs for one source with bounded concurrency.
+
+    Pages are first fetched over plain HTTP; only those that are not usable
+    server-rendered HTML are loaded in a single shared headless browser. Up
+    to SCRAPE_CONCURRENCY requests run at once and they start at least
+    SCRAPE_MIN_INTERVAL_SECONDS apart so the source host is not hit in bursts.
+    """
     logger = get_run_logger()
     scraped: list[dict] = []
     errors: list[dict] = []
 
-    for i, item in enumerate(items):
-        if i > 0:
-            time.sleep(5)
+    semaphore = asyncio.Semaphore(SCRAPE_CONCURRENCY)
+    pace_lock = asyncio.Lock()
+    loop = asyncio.get_running_loop()
+    next_start = loop.time()
+
+    async def wait_for_turn() -> None:
+        nonlocal next_start
+        async with pace_lock:
+            delay = next_start - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            next_start = loop.time() + SCRAPE_MIN_INTERVAL_SECONDS
+
+    def add_scraped(item: dict, text: str) -> None:
+        scraped.append(
+            {"source_name": item["source_name"], "text": text, "url": item["url"]}
+        )
+        logger.info("Scraped %s", item["url"])
+
+    async def fetch_item(session: aiohttp.ClientSession, item: dict) -> bool:
+        async with semaphore:
+            await wait_for_turn()
+            text = await _fetch_http(session, item["url"])
+        if text is None:
+            return False
+        add_scraped(item, text)
+        return True
+
+    async def scrape_item(context: BrowserContext, item: dict) -> None:
         url = item["url"]
-        try:
-            text = _do_scrape(url)
-            scraped.append(
-                {"source_name": item["source_name"], "text": text, "url": url}
-            )
-            logger.info("Scraped %s", url)
-        except Exception as exc:
-            logger.warning("Failed to scrape %s: %s", url, exc)
-            errors.append(
-                {
-                    "source_uuid": item["source_uuid"],
-                    "article_uuid": item["article_uuid"],
-                    "url": url,
-                    "error_message": str(exc),
-                }
+        async with semaphore:
+            await wait_for_turn()
+            try:
+                text = await asyncio.wait_for(
+                    _do_scrape(context, url), SCRAPE_PAGE_TIMEOUT_SECONDS
+                )
+                if not text:
+                    raise ValueError("page has no text")
+            except Exception as exc:
+                message = str(exc) or type(exc).__name__
+                logger.warning("Failed to scrape %s: %s", url, message)
+                errors.append(
+                    {
+                        "source_uuid": item["source_uuid"],
+                        "article_uuid": item["article_uuid"],
+                        "url": url,
+                        "error_message": message,
+                    }
+                )
+                return
+        add_scraped(item, text)
+
+    async with aiohttp.ClientSession(
+        headers={"User-Agent": USER_AGENT},
+        timeout=aiohttp.ClientTimeout(total=HTTP_TIMEOUT_SECONDS),
+    ) as session:
+        fetched = await asyncio.gather(*(fetch_item(session, item) for item in items))
+
+    browser_items = [item for item, ok in zip(items, fetched) if not ok]
+    if browser_items:
+        logger.info(
+            "%d/%d URLs need a browser render", len(browser_items), len(items)
+        )
+        async with _browser_context() as context:
+            await asyncio.gather(
+                *(scrape_item(context, item) for item in browser_items)
             )
 
     return scraped, errors
@@ -149,23 +281,24 @@ def save_scraping_errors(errors: list[dict]) -> int:
     try:
         now = datetime.now(tz=timezone.utc)
         records = [
-            SourceErrorLog(
-                source_uuid=e["source_uuid"],
-                source_url=e["url"],
-                status_code="SCRAPE_ERROR",
-                error_message=json.dumps(
+            {
+                "source_uuid": e["source_uuid"],
+                "source_url": e["url"],
+                "status_code": "SCRAPE_ERROR",
+                "error_message": json.dumps(
                     {
                         "source_uuid": e["source_uuid"],
                         "article_uuid": e["article_uuid"],
                         "error_message": e["error_message"],
                     }
                 ),
-                detected_at=now,
-                created_at=now,
-            )
+                "detected_at": now,
+                "created_at": now,
+            }
             for e in errors
         ]
-        session.add_all(records)
+        # Core executemany is sent as batched multi-row INSERTs
+        session.execute(insert(SourceErrorLog), records)
         session.commit()
         logger.info("Saved %d scraping errors", len(records))
         return len(records)
@@ -181,7 +314,11 @@ def save_scraping_errors(errors: list[dict]) -> int:
 
 @flow(name="get-link-content", log_prints=True)
 def run(limit: int = 0) -> None:
-    """Scrape article body text for all new RSS items and persist to the database."""
+    """Scrape article body text for all new RSS items and persist to the database.
+
+    One scraping task is mapped per source; how many sources run at once is
+    controlled by a Prefect concurrency limit on the 'scraping' tag.
+    """
     logger = get_run_logger()
     new_items = fetch_new_rss_items(limit)
 
@@ -193,14 +330,20 @@ def run(limit: int = 0) -> None:
     for item in new_items:
         grouped[item["source_uuid"]].append(item)
 
-    futures = [scrape_source_urls.submit(items) for items in grouped.values()]  # type: ignore[attr-defined]
-    results = [f.result(raise_on_failure=False) for f in futures]
+    results = scrape_source_urls.map(list(grouped.values())).result(  # type: ignore[attr-defined]
+        raise_on_failure=False
+    )
 
     all_scraped: list[dict] = []
     all_errors: list[dict] = []
     for result in results:
         if isinstance(result, tuple):
             scraped, errors = result
+            # Boilerplate comes from the site template, so trim within a source
+            texts = [article["text"] for article in scraped]
+            prefix, suffix = common_affixes(texts)
+            for article, text in zip(scraped, texts):
+                article["text"] = text[prefix : len(text) - suffix]
             all_scraped.extend(scraped)
             all_errors.extend(errors)
         else:
@@ -220,13 +363,6 @@ def run(limit: int = 0) -> None:
         logger.warning("No articles scraped successfully; nothing to save")
         return
 
-    words = [article["text"].split(" ") for article in all_scraped]
-    prefix = common_prefix_length(*words)
-    suffix = common_suffix_length(*words)
-
-    for article, word_list in zip(all_scraped, words):
-        article["text"] = " ".join(word_list[prefix : len(word_list) - suffix])
-
     save_articles(all_scraped)
 
 
@@ -2,36 +2,106 @@
 
 from __future__ import annotations
 
+import asyncio
 import calendar
 import hashlib
+import io
+import json
 import re
+import socket
+from collections import Counter
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+from functools import lru_cache
+from itertools import chain
 from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
+from xml.etree import ElementTree
 
+import aiohttp
 import feedparser
 import requests
 from dateutil import parser as date_parser
 from loguru import logger
 from prefect import flow, task
-from sqlalchemy import select
+from requests.adapters import HTTPAdapter
+from sqlalchemy import Text, column, or_, select, update, values
 from sqlalchemy.dialects.postgresql import insert as pg_insert
 from tenacity import retry, stop_after_attempt, wait_fixed
 
 from connectors.database import get_db_session
-from models.entities import ExtractedArticleUrl, SourceErrorLog, SourcesMasterList
+from models.entities import (
+    ExtractedArticleUrl,
+    RedirectCache,
+    SourceErrorLog,
+    SourceFeedValidator,
+    SourcesMasterList,
+)
 
 # --- Constants ---
 USER_AGENT = "threat-intel/0.1 (+https://localhost)"
 REQUEST_TIMEOUT = 20
+HTTP_POOL_SIZE = 64
+FEED_FETCH_CONCURRENCY = 32
+DNS_CACHE_TTL_SECONDS = 300
+REDIRECT_CACHE_SIZE = 20_000
+# Hosts whose links resolved to themselves this many times in a row are trusted
+# not to redirect and skip the HEAD request
+REDIRECT_SKIP_AFTER = 5
+REDIRECT_CONCURRENCY = 16
+# Stored redirect mappings older than this are resolved again
+REDIRECT_CACHE_TTL_DAYS = 30
+# Notes on URLs whose final URL was not looked up; these are never stored
+REDIRECT_UNVERIFIED_NOTES = ("redirect_failed", "redirect_skipped")
 DEFAULT_WINDOW_HOURS = 24
 DEFAULT_MAX_ITEMS = 100
+DEFAULT_POLL_INTERVAL_MINUTES = 30
+# Buffered article rows across sources are written once this many accumulate
+ARTICLE_FLUSH_ROWS = 1000
 
 FEED_EXTENSIONS = (".xml", ".rss", ".rdf", ".atom")
 FEED_MARKERS = ("alt=rss", "format=rss", "/feed", "/feeds/", "rss.xml", "feed.xml")
 INDEX_MARKERS = ("/tag/", "/tags/", "/category/", "/categories/", "/author/", "/search")
 TRACKING_PARAMS_PREFIX = ("utm_",)
 TRACKING_PARAMS_EXACT = {"gclid", "fbclid", "mc_cid", "mc_eid"}
+DATE_ONLY_RE = re.compile(r"\d{4}-\d{2}-\d{2}")
+
+# Marker lists compiled to single alternations, scanned in one pass per URL
+FEED_MARKER_RE = re.compile("|".join(map(re.escape, FEED_MARKERS)))
+INDEX_MARKER_RE = re.compile("|".join(map(re.escape, INDEX_MARKERS)))
+TRACKING_PARAM_RE = re.compile(
+    "|".join(
+        [
+            *map(re.escape, TRACKING_PARAMS_PREFIX),
+            *(re.escape(name) + "$" for name in sorted(TRACKING_PARAMS_EXACT)),
+        ]
+    ),
+    re.IGNORECASE,
+)
+
+# Feeds whose root matches go through the streaming parser instead of feedparser
+FAST_PARSE_ROOT_MARKERS = (b"<rss", b"<feed")
+FEED_CONTENT_TYPES = ("xml", "rss", "atom", "json")
+ATOM_NS = "http://www.w3.org/2005/Atom"
+DC_NS = "http://purl.org/dc/elements/1.1/"
+# Root element -> item element; RSS 2.0 is un-namespaced, Atom 1.0 is not.
+# Other roots (RSS 1.0, Atom 0.3) are left to feedparser.
+FAST_PARSE_ITEMS = {("", "rss"): ("", "item"), (ATOM_NS, "feed"): (ATOM_NS, "entry")}
+# Item child element -> entry key as used by feedparser. Children in other
+# namespaces (media:title, itunes:title, atom:link in RSS, ...) are ignored so
+# extension elements cannot shadow the core fields.
+FAST_PARSE_FIELDS = {
+    ("", "guid"): "id",
+    ("", "title"): "title",
+    ("", "pubDate"): "published",
+    (ATOM_NS, "id"): "id",
+    (ATOM_NS, "title"): "title",
+    (ATOM_NS, "published"): "published",
+    (ATOM_NS, "updated"): "updated",
+    (DC_NS, "date"): "updated",
+}
 
 _HTTP_ERROR_MAP = {
     401: ("HTTP_401_UNAUTHORIZED", "HTTP 401"),
@@ -47,6 +117,8 @@ class FetchResult:
     status_code: str
     message: str
     content: bytes | None
+    etag: str | None = None
+    last_modified: str | None = None
 
 
 # --- URL Utilities (pure functions) ---
@@ -72,18 +144,11 @@ def normalize_url(url: str) -> tuple[str, list[str]]:
         notes.append("normalized_trailing_slash")
 
     query_pairs = parse_qsl(parsed.query, keep_blank_values=True)
-    filtered, removed = [], False
-    for key, value in query_pairs:
-        key_lower = key.lower()
-        if (
-            key_lower.startswith(TRACKING_PARAMS_PREFIX)
-            or key_lower in TRACKING_PARAMS_EXACT
-        ):
-            removed = True
-            continue
-        filtered.append((key, value))
+    filtered = [
+        (key, value) for key, value in query_pairs if not TRACKING_PARAM_RE.match(key)
+    ]
 
-    if removed:
+    if len(filtered) != len(query_pairs):
         notes.append("removed_tracking_params")
     if parsed.fragment:
         notes.append("removed_fragment")
@@ -102,15 +167,17 @@ def validate_url(url: str, source_url: str) -> tuple[bool, list[str]]:
     lower_url = url.lower()
     if lower_url.endswith(FEED_EXTENSIONS):
         return False, ["feed_extension"]
-    if any(marker in lower_url for marker in FEED_MARKERS):
+    if FEED_MARKER_RE.search(lower_url):
         return False, ["feed_marker"]
-    if any(marker in urlparse(url).path.lower() for marker in INDEX_MARKERS):
+    # Lowercasing keeps the URL structure, so the path is parsed from lower_url
+    if INDEX_MARKER_RE.search(urlparse(lower_url).path):
         return False, ["index_like_url"]
     return True, []
 
 
 def compute_article_uuid(canonical_url: str) -> str:
-    digest = hashlib.sha256(canonical_url.encode("utf-8")).hexdigest()[:16]
+    # Same id as hexdigest()[:16] without hex-encoding the discarded bytes
+    digest = hashlib.sha256(canonical_url.encode("utf-8")).digest()[:8].hex()
     return f"A_{digest}"
 
 
@@ -139,17 +206,35 @@ def extract_entry_datetime(entry: dict) -> tuple[datetime | None, list[str]]:
         or ""
     )
     if raw:
+        raw = raw.strip()
+        # Cheap stdlib parsers for the common formats before the dateutil
+        # heuristics: RFC 822 (RSS), plain dates and ISO 8601 (Atom).
         try:
-            dt = date_parser.parse(raw)
+            dt = parsedate_to_datetime(raw)
+        except (TypeError, ValueError):
+            dt = None
+        if dt is None and DATE_ONLY_RE.fullmatch(raw):
+            try:
+                dt = datetime.strptime(raw, "%Y-%m-%d")
+                notes.append("date_only_assumed_midnight")
+            except ValueError:
+                pass
+        if dt is None:
+            try:
+                dt = datetime.fromisoformat(raw)
+            except ValueError:
+                pass
+        if dt is None:
+            try:
+                dt = date_parser.parse(raw)
+            except Exception:
+                notes.append("date_parse_error")
+
+        if dt is not None:
             if dt.tzinfo is None:
                 notes.append("assumed_utc_no_tz")
                 dt = dt.replace(tzinfo=timezone.utc)
-            if re.fullmatch(r"\d{4}-\d{2}-\d{2}", raw.strip()):
-                notes.append("date_only_assumed_midnight")
-                dt = dt.replace(hour=0, minute=0, second=0, microsecond=0)
             return dt, notes
-        except Exception:
-            notes.append("date_parse_error")
 
     return None, ["missing_date"]
 
@@ -157,98 +242,317 @@ def extract_entry_datetime(entry: dict) -> tuple[datetime | None, list[str]]:
 # --- HTTP Helpers ---
 
 
-@retry(wait=wait_fixed(2), stop=stop_after_attempt(3))
-def _http_get(url: str, **kwargs) -> requests.Response:
-    return requests.get(
-        url,
-        headers={"User-Agent": USER_AGENT},
-        timeout=REQUEST_TIMEOUT,
-        allow_redirects=True,
-        **kwargs,
+def _build_http_session() -> requests.Session:
+    """Session with pooled keep-alive connections shared by all source tasks."""
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE, max_retries=0
     )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers["User-Agent"] = USER_AGENT
+    return session
+
+
+_http_session = _build_http_session()
+
+
+@retry(wait=wait_fixed(2), stop=stop_after_attempt(3), reraise=True)
+async def _http_get(
+    session: aiohttp.ClientSession,
+    semaphore: asyncio.Semaphore,
+    url: str,
+    headers: dict[str, str],
+) -> tuple[int, Mapping[str, str], bytes]:
+    # The session's total timeout starts at session.get, so take a slot first;
+    # waiting for a pooled connection would otherwise count against it
+    async with semaphore:
+        async with session.get(url, headers=headers, allow_redirects=True) as response:
+            return response.status, response.headers.copy(), await response.read()
+
+
+def _classify_response(status: int, content_type: str, content: bytes) -> FetchResult:
+    """Map an HTTP status and Content-Type to a FetchResult."""
+    if status == 304:
+        return FetchResult(False, "NOT_MODIFIED", "HTTP 304", None)
+    if status in _HTTP_ERROR_MAP:
+        code, msg = _HTTP_ERROR_MAP[status]
+        return FetchResult(False, code, msg, content)
+    if 500 <= status <= 599:
+        return FetchResult(False, "HTTP_5XX_SERVER_ERROR", f"HTTP {status}", content)
+    if status != 200:
+        return FetchResult(False, "UNKNOWN_ERROR", f"HTTP {status}", content)
+
+    content_type = content_type.lower()
+    if content_type and not any(t in content_type for t in FEED_CONTENT_TYPES):
+        return FetchResult(
+            False, "INVALID_CONTENT_TYPE", f"Content-Type {content_type}", content
+        )
+
+    return FetchResult(True, "OK", "OK", content)
+
+
+async def fetch_feed(
+    session: aiohttp.ClientSession,
+    semaphore: asyncio.Semaphore,
+    url: str,
+    etag: str | None = None,
+    last_modified: str | None = None,
+) -> FetchResult:
+    """Fetch RSS feed bytes from URL with retry.
 
+    The validators from the previous fetch are sent as a conditional request,
+    so an unchanged feed comes back as NOT_MODIFIED without a body.
+    """
+    headers: dict[str, str] = {}
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
 
-def fetch_feed(url: str) -> FetchResult:
-    """Fetch RSS feed bytes from URL with retry."""
     try:
-        response = _http_get(url)
-    except requests.Timeout:
+        status, response_headers, content = await _http_get(
+            session, semaphore, url, headers
+        )
+    except asyncio.TimeoutError:
         return FetchResult(False, "CONNECTION_TIMEOUT", "Timeout", None)
-    except requests.exceptions.SSLError as exc:
+    except aiohttp.ClientSSLError as exc:
         return FetchResult(False, "SSL_ERROR", f"SSL error: {exc}", None)
-    except requests.exceptions.ConnectionError as exc:
-        msg = str(exc).lower()
+    except aiohttp.ClientConnectorError as exc:
         code = (
             "DNS_ERROR"
-            if ("name or service not known" in msg or "nodename nor servname" in msg)
+            if isinstance(exc.os_error, socket.gaierror)
             else "CONNECTION_REFUSED"
         )
         return FetchResult(False, code, f"Connection error: {exc}", None)
-    except requests.RequestException as exc:
+    except aiohttp.ClientError as exc:
         return FetchResult(False, "UNKNOWN_ERROR", f"Request error: {exc}", None)
 
-    if response.status_code in _HTTP_ERROR_MAP:
-        code, msg = _HTTP_ERROR_MAP[response.status_code]
-        return FetchResult(False, code, msg, response.content)
-    if 500 <= response.status_code <= 599:
-        return FetchResult(
-            False,
-            "HTTP_5XX_SERVER_ERROR",
-            f"HTTP {response.status_code}",
-            response.content,
-        )
-    if response.status_code != 200:
-        return FetchResult(
-            False, "UNKNOWN_ERROR", f"HTTP {response.status_code}", response.content
-        )
+    result = _classify_response(
+        status, response_headers.get("Content-Type") or "", content
+    )
+    if result.ok:
+        result.etag = response_headers.get("ETag")
+        result.last_modified = response_headers.get("Last-Modified")
+    return result
 
-    content_type = (response.headers.get("Content-Type") or "").lower()
-    if content_type and not any(t in content_type for t in ("xml", "rss", "atom")):
-        return FetchResult(
-            False,
-            "INVALID_CONTENT_TYPE",
-            f"Content-Type {content_type}",
-            response.content,
-        )
 
-    return FetchResult(True, "OK", "OK", response.content)
+# Consecutive non-redirecting resolutions per host
+_identity_streak: Counter[str] = Counter()
+
+
+@lru_cache(maxsize=REDIRECT_CACHE_SIZE)
+def _resolve_final_url(url: str) -> str:
+    """Follow redirects with HEAD, falling back to GET; failures are not cached."""
+    try:
+        with _http_session.head(
+            url, timeout=REQUEST_TIMEOUT, allow_redirects=True
+        ) as resp:
+            if resp.status_code in (405, 403):
+                raise requests.RequestException("HEAD not allowed")
+            return resp.url
+    except requests.RequestException:
+        with _http_session.get(
+            url, timeout=REQUEST_TIMEOUT, allow_redirects=True, stream=True
+        ) as resp:
+            return resp.url
 
 
 def resolve_redirects(url: str) -> tuple[str, list[str]]:
-    """Follow HTTP redirects to get the final URL."""
+    """Follow HTTP redirects to get the final URL.
+
+    Results are memoised per URL, so links syndicated across several feeds
+    are only resolved once per worker process. Hosts that keep linking to
+    their final URLs stop being checked for the rest of the process; those
+    URLs are returned unchanged with a redirect_skipped note.
+    """
     notes: list[str] = []
+    host = urlparse(url).netloc
+    if _identity_streak[host] >= REDIRECT_SKIP_AFTER:
+        return url, ["redirect_skipped"]
     try:
-        resp = requests.head(
-            url,
-            headers={"User-Agent": USER_AGENT},
-            timeout=REQUEST_TIMEOUT,
-            allow_redirects=True,
-        )
-        if resp.status_code in (405, 403):
-            raise requests.RequestException("HEAD not allowed")
-        final_url = resp.url
-        resp.close()
-    except requests.RequestException:
-        try:
-            resp = requests.get(
-                url,
-                headers={"User-Agent": USER_AGENT},
-                timeout=REQUEST_TIMEOUT,
-                allow_redirects=True,
-                stream=True,
-            )
-            final_url = resp.url
-            resp.close()
-        except requests.RequestException as exc:
-            return url, [f"redirect_failed:{exc}"]
+        final_url = _resolve_final_url(url)
+    except requests.RequestException as exc:
+        return url, [f"redirect_failed:{exc}"]
 
     if final_url != url:
         notes.append("resolved_redirects")
+        _identity_streak[host] = 0
+    else:
+        _identity_streak[host] += 1
     return final_url, notes
 
 
+def _load_stored_redirects(urls: list[str], now_utc: datetime) -> dict[str, str]:
+    """Look up final URLs resolved by earlier runs within the cache TTL."""
+    session = get_db_session()
+    try:
+        rows = session.execute(
+            select(RedirectCache.url_original, RedirectCache.url_final).where(
+                RedirectCache.url_original.in_(urls),
+                RedirectCache.resolved_at
+                >= now_utc - timedelta(days=REDIRECT_CACHE_TTL_DAYS),
+            )
+        )
+        return {row.url_original: row.url_final for row in rows}
+    except Exception as exc:
+        logger.warning("Redirect cache lookup failed: {}", exc)
+        return {}
+    finally:
+        session.close()
+
+
+def _store_redirects(mappings: dict[str, str], now_utc: datetime) -> None:
+    """Persist resolved final URLs so later runs can skip the HTTP lookup."""
+    if not mappings:
+        return
+    session = get_db_session()
+    try:
+        stmt = pg_insert(RedirectCache).values(
+            [
+                {"url_original": url, "url_final": final_url, "resolved_at": now_utc}
+                for url, final_url in mappings.items()
+            ]
+        )
+        session.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[RedirectCache.url_original],
+                set_={
+                    "url_final": stmt.excluded.url_final,
+                    "resolved_at": stmt.excluded.resolved_at,
+                },
+            )
+        )
+        session.commit()
+    except Exception as exc:
+        session.rollback()
+        logger.warning("Redirect cache update failed: {}", exc)
+    finally:
+        session.close()
+
+
+def resolve_redirects_many(
+    urls: list[str], now_utc: datetime
+) -> list[tuple[str, list[str]]]:
+    """Resolve redirects for several URLs, reusing mappings from earlier runs.
+
+    Only URLs missing from the redirect_cache table are fetched, concurrently
+    since the lookups are network-bound; successful resolutions are stored,
+    while failed and skipped lookups are not, as neither was verified.
+    """
+    if not urls:
+        return []
+    stored = _load_stored_redirects(urls, now_utc)
+    misses = [url for url in dict.fromkeys(urls) if url not in stored]
+    if len(misses) > 1:
+        with ThreadPoolExecutor(max_workers=REDIRECT_CONCURRENCY) as pool:
+            fetched = dict(zip(misses, pool.map(resolve_redirects, misses)))
+    else:
+        fetched = {url: resolve_redirects(url) for url in misses}
+    _store_redirects(
+        {
+            url: final_url
+            for url, (final_url, notes) in fetched.items()
+            if not any(note.startswith(REDIRECT_UNVERIFIED_NOTES) for note in notes)
+        },
+        now_utc,
+    )
+
+    results: list[tuple[str, list[str]]] = []
+    for url in urls:
+        if url in stored:
+            final_url = stored[url]
+            notes = ["resolved_redirects"] if final_url != url else []
+            results.append((final_url, notes))
+        else:
+            results.append(fetched[url])
+    return results
+
+
+def _split_tag(tag: str) -> tuple[str, str]:
+    """Split an ElementTree "{namespace}local" tag into its two parts."""
+    if tag[:1] == "{":
+        namespace, _, local = tag[1:].partition("}")
+        return namespace, local
+    return "", tag
+
+
+def _fast_parse(content: bytes) -> list[dict] | None:
+    """Extract link, id, title and dates from RSS 2.0 or Atom 1.0 items.
+
+    Items are streamed with iterparse and cleared once read, so memory stays
+    flat regardless of feed size. Returns None for other root elements, and
+    for feeds with relative links, which feedparser resolves against xml:base.
+    Raises ParseError on malformed XML.
+    """
+    entries: list[dict] = []
+    item_tag = None
+    events = ElementTree.iterparse(io.BytesIO(content), events=("start", "end"))
+    for event, elem in events:
+        if item_tag is None:
+            item_tag = FAST_PARSE_ITEMS.get(_split_tag(elem.tag))
+            if item_tag is None:
+                return None
+        if event != "end" or _split_tag(elem.tag) != item_tag:
+            continue
+        entry: dict = {}
+        for child in elem:
+            tag = _split_tag(child.tag)
+            if tag[0] not in (item_tag[0], DC_NS):
+                continue
+            if tag == ("", "link"):
+                entry.setdefault("link", (child.text or "").strip())
+            elif tag == (ATOM_NS, "link"):
+                href = child.get("href")
+                if href and child.get("rel", "alternate") == "alternate":
+                    entry.setdefault("link", href.strip())
+            elif tag in FAST_PARSE_FIELDS:
+                entry.setdefault(FAST_PARSE_FIELDS[tag], (child.text or "").strip())
+        if entry.get("link") and not urlparse(entry["link"]).scheme:
+            return None
+        entries.append(entry)
+        elem.clear()
+    return entries
+
+
+def _parse_json_feed(content: bytes) -> list[dict]:
+    """Map JSON Feed items to the entry keys used by feedparser."""
+    items = json.loads(content).get("items") or []
+    return [
+        {
+            "link": item.get("url") or item.get("external_url") or "",
+            "id": item.get("id") or "",
+            "title": item.get("title") or "",
+            "published": item.get("date_published") or "",
+            "updated": item.get("date_modified") or "",
+        }
+        for item in items
+        if isinstance(item, dict)
+    ]
+
+
 def parse_feed(content: bytes) -> tuple[list, str]:
-    """Parse RSS feed bytes into a list of entries."""
+    """Parse RSS feed bytes into a list of entries.
+
+    JSON Feed, which feedparser does not read, is parsed with json. Plain
+    RSS 2.0 and Atom 1.0 feeds are streamed with ElementTree; other formats
+    and XML it cannot read fall back to feedparser.
+    """
+    if content[:64].lstrip()[:1] == b"{":
+        try:
+            return _parse_json_feed(content), ""
+        except (ValueError, AttributeError) as exc:
+            return [], f"json_feed_error: {exc}"
+
+    head = content[:512].lower()
+    if any(marker in head for marker in FAST_PARSE_ROOT_MARKERS):
+        try:
+            entries = _fast_parse(content)
+        except ElementTree.ParseError:
+            entries = None
+        if entries is not None:
+            return entries, ""
+
     parsed = feedparser.parse(content)
     error_message = ""
     if getattr(parsed, "bozo", False) and getattr(parsed, "bozo_exception", None):
@@ -262,10 +566,15 @@ def build_article_rows(
     now_utc: datetime,
     window_start: datetime,
     max_items: int,
+    resolve_redirects_inline: bool = False,
 ) -> list[dict]:
-    """Filter and transform feed entries into DB-ready row dicts."""
-    rows: list[dict] = []
+    """Filter and transform feed entries into DB-ready row dicts.
 
+    Redirects are only followed when `resolve_redirects_inline` is set; by
+    default the normalised feed link is stored and the scraper follows any
+    redirects when it loads the article itself.
+    """
+    candidates: list[tuple] = []
     for entry in entries[:max_items]:
         published_dt, dt_notes = extract_entry_datetime(entry)
         if published_dt is None:
@@ -284,22 +593,42 @@ def build_article_rows(
             continue
 
         normalized_original, norm_notes = normalize_url(url_original)
-        final_url, redirect_notes = resolve_redirects(normalized_original)
-        canonical_final, final_notes = normalize_url(final_url)
+        candidates.append(
+            (
+                entry,
+                published_utc,
+                url_original,
+                normalized_original,
+                [*dt_notes, *url_notes, *norm_notes],
+            )
+        )
+
+    normalized_urls = [candidate[3] for candidate in candidates]
+    if resolve_redirects_inline:
+        resolved = resolve_redirects_many(normalized_urls, now_utc)
+    else:
+        resolved = [(url, []) for url in normalized_urls]
+
+    rows: list[dict] = []
+    for candidate, (final_url, redirect_notes) in zip(candidates, resolved):
+        entry, published_utc, url_original, normalized_original, entry_notes = (
+            candidate
+        )
+        # Normalising is idempotent, so unredirected links are already canonical
+        if final_url == normalized_original:
+            canonical_final, final_notes = normalized_original, []
+        else:
+            canonical_final, final_notes = normalize_url(final_url)
 
         ok_final, final_url_notes = validate_url(canonical_final, source.source_url)
         if not ok_final:
             continue
 
-        all_notes = (
-            dt_notes
-            + url_notes
-            + norm_notes
-            + redirect_notes
-            + final_notes
-            + final_url_notes
+        all_notes = set(
+            chain(entry_notes, redirect_notes, final_notes, final_url_notes)
         )
-        notes_str = ",".join(sorted(set(n for n in all_notes if n))) or None
+        all_notes.discard("")
+        notes_str = ",".join(sorted(all_notes)) if all_notes else None
 
         title_raw = entry.get("title")
         title = title_raw.strip() or None if isinstance(title_raw, str) else None
@@ -346,42 +675,129 @@ def _save_error_record(
     session.add(record)
 
 
-def _save_articles(rows: list[dict], session) -> int:
+def _save_articles(rows: list[dict], session) -> Counter[str]:
+    """Insert article rows, returning the number inserted per source_uuid.
+
+    Links syndicated across several feeds in one batch are sent once; the
+    first occurrence wins, as it would with ON CONFLICT DO NOTHING.
+    """
     if not rows:
-        return 0
+        return Counter()
+    unique: dict[str, dict] = {}
+    for row in rows:
+        unique.setdefault(row["article_uuid"], row)
     stmt = (
         pg_insert(ExtractedArticleUrl)
-        .values(rows)
+        .values(list(unique.values()))
         .on_conflict_do_nothing(index_elements=[ExtractedArticleUrl.article_uuid])
+        .returning(ExtractedArticleUrl.source_uuid)
     )
-    result = session.execute(stmt)
-    return result.rowcount or 0
+    return Counter(session.execute(stmt).scalars())
 
 
-def _update_source_status(
-    source_uuid: str,
-    status: str,
-    status_code: str,
-    now_utc: datetime,
-    update_last_ok: bool,
-    session,
+def _save_feed_validators(
+    validators: list[tuple[str, FetchResult]], now_utc: datetime, session
 ) -> None:
-    source = session.get(SourcesMasterList, source_uuid)
-    if source is None:
-        logger.warning("Source %s not found for status update", source_uuid)
+    """Remember each feed's ETag and Last-Modified for the next conditional fetch."""
+    if not validators:
         return
-    source.status = status
-    source.status_code = status_code
-    if update_last_ok:
-        source.last_ok_status_utc_iso = now_utc
+    stmt = pg_insert(SourceFeedValidator).values(
+        [
+            {
+                "source_uuid": source_uuid,
+                "etag": fetch_result.etag,
+                "last_modified": fetch_result.last_modified,
+                "updated_at": now_utc,
+            }
+            for source_uuid, fetch_result in validators
+        ]
+    )
+    session.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[SourceFeedValidator.source_uuid],
+            set_={
+                "etag": stmt.excluded.etag,
+                "last_modified": stmt.excluded.last_modified,
+                "updated_at": stmt.excluded.updated_at,
+            },
+        )
+    )
+
+
+def _update_source_statuses(
+    status_codes: list[tuple[str, str]], now_utc: datetime, session
+) -> None:
+    """Mark sources as polled OK, each with its own status code, in one UPDATE."""
+    if not status_codes:
+        return
+    codes = values(
+        column("source_uuid", Text), column("status_code", Text), name="codes"
+    ).data(status_codes)
+    session.execute(
+        update(SourcesMasterList)
+        .where(SourcesMasterList.source_uuid == codes.c.source_uuid)
+        .values(
+            status="OK",
+            status_code=codes.c.status_code,
+            last_ok_status_utc_iso=now_utc,
+        )
+        .execution_options(synchronize_session=False)
+    )
 
 
 # --- Prefect Tasks ---
 
 
+@task(name="fetch-feed-validators", tags=["rss-db"])
+def fetch_feed_validators(
+    source_uuids: list[str],
+) -> dict[str, tuple[str | None, str | None]]:
+    """Load stored ETag and Last-Modified values keyed by source_uuid."""
+    session = get_db_session()
+    try:
+        rows = session.execute(
+            select(
+                SourceFeedValidator.source_uuid,
+                SourceFeedValidator.etag,
+                SourceFeedValidator.last_modified,
+            ).where(SourceFeedValidator.source_uuid.in_(source_uuids))
+        )
+        return {row.source_uuid: (row.etag, row.last_modified) for row in rows}
+    finally:
+        session.close()
+
+
+@task(name="fetch-rss-feeds", tags=["rss-processing"])
+async def fetch_feeds(
+    feeds: list[tuple[str, str | None, str | None]],
+) -> list[FetchResult]:
+    """Fetch all feeds concurrently over one pooled HTTP session."""
+    semaphore = asyncio.Semaphore(FEED_FETCH_CONCURRENCY)
+    connector = aiohttp.TCPConnector(
+        limit=FEED_FETCH_CONCURRENCY, ttl_dns_cache=DNS_CACHE_TTL_SECONDS
+    )
+    async with aiohttp.ClientSession(
+        connector=connector,
+        headers={"User-Agent": USER_AGENT},
+        timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT),
+    ) as session:
+        return await asyncio.gather(
+            *(
+                fetch_feed(session, semaphore, url, etag, last_modified)
+                for url, etag, last_modified in feeds
+            )
+        )
+
+
 @task(name="fetch-rss-sources", tags=["rss-db"])
-def fetch_rss_sources(limit: int = 0) -> list[SourcesMasterList]:
-    """Load active RSS sources from the database."""
+def fetch_rss_sources(
+    limit: int = 0, due_before: datetime | None = None
+) -> list[SourcesMasterList]:
+    """Load active RSS sources from the database.
+
+    With `due_before`, sources last polled successfully at or after that time
+    are left out.
+    """
     session = get_db_session()
     try:
         query = (
@@ -393,6 +809,13 @@ def fetch_rss_sources(limit: int = 0) -> list[SourcesMasterList]:
             )
             .order_by(SourcesMasterList.source_number)
         )
+        if due_before is not None:
+            query = query.where(
+                or_(
+                    SourcesMasterList.last_ok_status_utc_iso.is_(None),
+                    SourcesMasterList.last_ok_status_utc_iso < due_before,
+                )
+            )
         if limit > 0:
             query = query.limit(limit)
         return list(session.execute(query).scalars().all())
@@ -400,32 +823,64 @@ def fetch_rss_sources(limit: int = 0) -> list[SourcesMasterList]:
         session.close()
 
 
-@task(
-    name="process-rss-source",
-    task_run_name="process-{source.source_name}",
-    retries=1,
-    retry_delay_seconds=5,
-    tags=["rss-processing"],
-)
-def process_source(
+def _prepare_source(
     source: SourcesMasterList,
+    fetch_result: FetchResult,
     now_utc: datetime,
     window_start: datetime,
     max_items: int = DEFAULT_MAX_ITEMS,
-    dry_run: bool = False,
-) -> dict:
-    """Fetch, parse, and store article URLs for a single RSS source."""
+    resolve_redirects_inline: bool = False,
+) -> tuple[str, list[dict]]:
+    """Parse a fetched RSS source into its status code and article rows."""
+    if fetch_result.status_code == "NOT_MODIFIED":
+        logger.info("source_uuid={} feed not modified", source.source_uuid)
+        return fetch_result.status_code, []
+
+    if not fetch_result.ok:
+        logger.warning(
+            "Fetch failed for {}: {} - {}",
+            source.source_url,
+            fetch_result.status_code,
+            fetch_result.message,
+        )
+        return fetch_result.status_code, []
+
+    entries, parse_warn = parse_feed(fetch_result.content or b"")
+    rows = build_article_rows(
+        entries,
+        source,
+        now_utc,
+        window_start,
+        max_items,
+        resolve_redirects_inline,
+    )
+
+    if not rows:
+        status_code = "PARSING_ERROR" if parse_warn else "NO_RECENT_ARTICLES"
+    elif parse_warn:
+        status_code = "PARSING_ERROR"
+    else:
+        status_code = "OK"
+    return status_code, rows
+
+
+@retry(wait=wait_fixed(5), stop=stop_after_attempt(2), reraise=True)
+def _store_sources(pending: list[tuple], now_utc: datetime) -> Counter[str]:
+    """Write buffered article rows, statuses and validators in one transaction.
+
+    Returns the number of newly inserted articles per source_uuid.
+    """
     session = get_db_session()
     try:
-        fetch_result = fetch_feed(source.source_url)
-        if not fetch_result.ok:
-            logger.warning(
-                "Fetch failed for %s: %s - %s",
-                source.source_url,
-                fetch_result.status_code,
-                fetch_result.message,
-            )
-            if not dry_run:
+        inserted = _save_articles(
+            [row for *_, rows in pending for row in rows], session
+        )
+        polled: list[tuple[str, str]] = []
+        validators: list[tuple[str, FetchResult]] = []
+        for source, fetch_result, status_code, _ in pending:
+            if status_code == "NOT_MODIFIED":
+                polled.append((source.source_uuid, status_code))
+            elif not fetch_result.ok:
                 _save_error_record(
                     source,
                     fetch_result.status_code,
@@ -433,52 +888,112 @@ def process_source(
                     now_utc,
                     session,
                 )
-                session.commit()
-            return {
-                "source_uuid": source.source_uuid,
-                "inserted": 0,
-                "deduped": 0,
-                "status_code": fetch_result.status_code,
-            }
+            else:
+                polled.append((source.source_uuid, status_code))
+                validators.append((source.source_uuid, fetch_result))
+        _update_source_statuses(polled, now_utc, session)
+        _save_feed_validators(validators, now_utc, session)
+        session.commit()
+        return inserted
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.close()
 
-        entries, parse_warn = parse_feed(fetch_result.content or b"")
-        rows = build_article_rows(entries, source, now_utc, window_start, max_items)
 
-        if not rows:
-            status_code = "PARSING_ERROR" if parse_warn else "NO_RECENT_ARTICLES"
-        elif parse_warn:
-            status_code = "PARSING_ERROR"
-        else:
-            status_code = "OK"
+def _flush_sources(
+    pending: list[tuple], now_utc: datetime, dry_run: bool
+) -> list[dict]:
+    """Store a buffer of prepared sources and build their per-source results.
 
-        inserted = 0
-        if not dry_run:
-            inserted = _save_articles(rows, session)
-            _update_source_status(
-                source.source_uuid, "OK", status_code, now_utc, True, session
-            )
-            session.commit()
+    Raises once the store has failed after its retry, e.g. during a DB outage.
+    """
+    try:
+        inserted = Counter() if dry_run else _store_sources(pending, now_utc)
+    except Exception:
+        logger.exception("Storing {} sources failed", len(pending))
+        raise
 
-        deduped = max(0, len(rows) - inserted)
+    results: list[dict] = []
+    for source, _, status_code, rows in pending:
+        source_inserted = inserted[source.source_uuid]
+        deduped = max(0, len(rows) - source_inserted)
         logger.info(
-            "source_uuid=%s status_code=%s rows_built=%s inserted=%s deduped=%s",
+            "source_uuid={} status_code={} rows_built={} inserted={} deduped={}",
             source.source_uuid,
             status_code,
             len(rows),
-            inserted,
+            source_inserted,
             deduped,
         )
-        return {
-            "source_uuid": source.source_uuid,
-            "inserted": inserted,
-            "deduped": deduped,
-            "status_code": status_code,
-        }
-    except Exception:
-        session.rollback()
-        raise
-    finally:
-        session.close()
+        results.append(
+            {
+                "source_uuid": source.source_uuid,
+                "inserted": source_inserted,
+                "deduped": deduped,
+                "status_code": status_code,
+            }
+        )
+    return results
+
+
+@task(name="process-rss-sources", tags=["rss-processing"])
+def process_sources(
+    sources: list[SourcesMasterList],
+    fetch_results: list[FetchResult],
+    now_utc: datetime,
+    window_start: datetime,
+    max_items: int = DEFAULT_MAX_ITEMS,
+    dry_run: bool = False,
+    resolve_redirects_inline: bool = False,
+) -> list[dict]:
+    """Parse and store article URLs for all fetched sources in one task.
+
+    Each source takes milliseconds once its feed is downloaded, far less than
+    the orchestration cost of a Prefect task per source. Rows from many
+    sources are buffered and written together every `ARTICLE_FLUSH_ROWS`
+    rows, with each buffer's statuses committed in the same transaction. A
+    source that fails to parse does not stop the rest, but the task fails once
+    every source has been handled; a buffer that fails to store after one
+    retry fails the task immediately.
+    """
+    results: list[dict | Exception] = []
+    pending: list[tuple] = []
+    pending_rows = 0
+    for source, fetch_result in zip(sources, fetch_results):
+        try:
+            status_code, rows = _prepare_source(
+                source,
+                fetch_result,
+                now_utc,
+                window_start,
+                max_items,
+                resolve_redirects_inline,
+            )
+        except Exception as exc:
+            logger.exception("Processing failed for {}", source.source_url)
+            results.extend(_flush_sources(pending, now_utc, dry_run))
+            pending, pending_rows = [], 0
+            results.append(exc)
+            continue
+
+        pending.append((source, fetch_result, status_code, rows))
+        pending_rows += len(rows)
+        if pending_rows >= ARTICLE_FLUSH_ROWS:
+            results.extend(_flush_sources(pending, now_utc, dry_run))
+            pending, pending_rows = [], 0
+
+    if pending:
+        results.extend(_flush_sources(pending, now_utc, dry_run))
+
+    failures = [result for result in results if isinstance(result, Exception)]
+    if failures:
+        # Stored sources stay committed; the run is still reported as failed
+        raise RuntimeError(
+            f"Processing failed for {len(failures)}/{len(results)} RSS sources"
+        ) from failures[0]
+    return results
 
 
 # --- Prefect Flow ---
@@ -490,33 +1005,53 @@ def run(
     max_items_per_feed: int = DEFAULT_MAX_ITEMS,
     limit_sources: int = 0,
     dry_run: bool = False,
+    resolve_redirects_inline: bool = False,
+    poll_interval_minutes: int = DEFAULT_POLL_INTERVAL_MINUTES,
 ) -> None:
-    """Collect RSS article URLs published within the last `window_hours` hours."""
+    """Collect RSS article URLs published within the last `window_hours` hours.
+
+    Sources polled successfully within the last `poll_interval_minutes` are
+    skipped; pass 0 to poll every active source.
+    """
     now_utc = datetime.now(tz=timezone.utc)
     window_start = now_utc - timedelta(hours=window_hours)
+    due_before = (
+        now_utc - timedelta(minutes=poll_interval_minutes)
+        if poll_interval_minutes > 0
+        else None
+    )
 
-    sources = fetch_rss_sources(limit_sources)
+    sources = fetch_rss_sources(limit_sources, due_before)
     if not sources:
-        logger.error("No active RSS sources found.")
+        logger.info("No active RSS sources due for polling.")
         return
 
-    logger.info("Found %d RSS sources to process", len(sources))
-
-    futures = [
-        process_source.submit(
-            source, now_utc, window_start, max_items_per_feed, dry_run
-        )
-        for source in sources
-    ]
-    results = [f.result(raise_on_failure=False) for f in futures]
+    logger.info("Found {} RSS sources to process", len(sources))
+
+    # Feed downloads are pure I/O, so they share one event loop; parsing and
+    # DB work for every source then runs in a single task. Stored validators
+    # turn unchanged feeds into bodyless 304 responses.
+    validators = fetch_feed_validators([source.source_uuid for source in sources])
+    fetch_results = fetch_feeds.submit(
+        [
+            (source.source_url, *validators.get(source.source_uuid, (None, None)))
+            for source in sources
+        ]
+    ).result()
+
+    results = process_sources(
+        sources,
+        fetch_results,
+        now_utc,
+        window_start,
+        max_items_per_feed,
+        dry_run,
+        resolve_redirects_inline,
+    )
 
-    total_inserted = sum(r.get("inserted", 0) for r in results if isinstance(r, dict))
-    successful = sum(1 for r in results if isinstance(r, dict))
+    total_inserted = sum(result["inserted"] for result in results)
     logger.info(
-        "Completed: %d sources, %d successful, %d articles inserted",
-        len(sources),
-        successful,
-        total_inserted,
+        "Completed: {} sources, {} articles inserted", len(results), total_inserted
     )
 
 
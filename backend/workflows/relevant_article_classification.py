@@ -2,28 +2,79 @@
 
 from __future__ import annotations
 
+import asyncio
+import hashlib
 import json
 import os
 from datetime import datetime, timezone
 
-import mlflow
+import aiohttp
+import httpx
 from dotenv import load_dotenv
 from google import genai
-from google.genai import types
+from google.genai import errors, types
+from google.genai.client import AsyncClient
 from prefect import flow, get_run_logger, task
-from sqlalchemy import select
-from tenacity import retry, stop_after_attempt, wait_fixed
+from prefect.concurrency.asyncio import rate_limit
+from prefect.futures import as_completed
+from pydantic import TypeAdapter
+from sqlalchemy import exists, insert, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from tenacity import (
+    retry,
+    retry_if_exception,
+    stop_after_attempt,
+    wait_exponential_jitter,
+)
 
-from connectors.database import get_db_session
-from models.entities import Article, ArticleClassificationLabel, SourceErrorLog
-from models.schemas import ArticleClassification
+from connectors.database import get_async_db_session, get_db_session
+from models.entities import (
+    Article,
+    ArticleClassificationCache,
+    ArticleClassificationLabel,
+    SourceErrorLog,
+)
+from models.schemas import ArticleClassification, ArticleClassificationItem
 from prompts.attack_classification import ATTACK_CLASSIFICATION_PROMPT
 
 FLOW_NAME = "classify-articles"
+# Global concurrency limit with slot decay that paces Gemini requests, e.g.
+# `prefect gcl create gemini-requests --limit 60 --slot-decay-per-second 1`
+LLM_RATE_LIMIT = "gemini-requests"
+# Classifications are written in batches of this size as they complete
+SAVE_BATCH_SIZE = 100
+# Articles per classification task, articles per LLM request, and concurrent
+# LLM requests within a task
+CLASSIFY_CHUNK_SIZE = 50
+CLASSIFY_BATCH_SIZE = 8
+CLASSIFY_CONCURRENCY = 8
+# Articles go to the cheaper model first; answers with any "Not Sure" label
+# are asked again of the stronger fallback model
+CLASSIFY_MODEL = "gemini-2.5-flash"
+CLASSIFY_FALLBACK_MODEL = "gemini-2.5-pro"
+LABEL_FIELDS = ("active_campaign", "cve", "digest")
+CACHE_LOOKUP_CHUNK_SIZE = 1000
+CLASSIFY_BATCH_PROMPT = (
+    f"{ATTACK_CLASSIFICATION_PROMPT}\n\n"
+    "The input is a JSON array of articles, each with an id and text. Classify "
+    "every article independently and return one classification per article, "
+    "carrying its id as article_id."
+)
+# Validates a batch response straight from JSON text in one pass
+CLASSIFICATION_ITEMS = TypeAdapter(list[ArticleClassificationItem])
+# The async Gemini client sends over aiohttp when it is installed, else httpx
+TRANSPORT_ERRORS = (aiohttp.ClientError, httpx.TransportError, TimeoutError)
 
-load_dotenv()
 
-client = genai.Client(api_key=os.getenv("API_KEY"))
+def _async_client() -> AsyncClient:
+    """Build a Gemini client for the calling task's event loop.
+
+    Prefect runs each async task under its own event loop and the client's
+    aiohttp session is bound to the loop that opened it, so clients are not
+    shared between tasks (the same reason the async DB engine uses NullPool).
+    """
+    load_dotenv()
+    return genai.Client(api_key=os.getenv("API_KEY")).aio
 
 
 # --- Prefect Tasks ---
@@ -33,45 +84,125 @@ client = genai.Client(api_key=os.getenv("API_KEY"))
 def load_articles() -> list[dict]:
     """Load unclassified articles from the database."""
     logger = get_run_logger()
+
+    # Anti-join so only articles without a label are read from the database
+    stmt = select(Article.id, Article.text, Article.url).where(
+        Article.text.isnot(None),
+        ~exists().where(ArticleClassificationLabel.article_id == Article.id),
+    )
+
     session = get_db_session()
     try:
-        classified_ids = {
-            row[0]
-            for row in session.execute(
-                select(ArticleClassificationLabel.article_id)
-            ).all()
-        }
-        rows = (
-            session.execute(select(Article).where(Article.text.isnot(None)))
-            .scalars()
-            .all()
+        articles = [dict(row) for row in session.execute(stmt).mappings()]
+        logger.info("Found %d unclassified articles", len(articles))
+        return articles
+    finally:
+        session.close()
+
+
+def _classification_key(article_text: str) -> str:
+    """Key a classification on the models, system prompt and normalised body."""
+    normalized = " ".join(article_text.split())
+    payload = "\x1f".join(
+        (
+            CLASSIFY_MODEL,
+            CLASSIFY_FALLBACK_MODEL,
+            ATTACK_CLASSIFICATION_PROMPT,
+            normalized,
         )
-        articles = [
-            {"id": a.id, "text": a.text, "url": a.url}
-            for a in rows
-            if a.id not in classified_ids
-        ]
-        logger.info(
-            "Found %d unclassified articles (skipped %d already classified)",
-            len(articles),
-            len(classified_ids),
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _is_unsure(row: dict) -> bool:
+    return any(row[field] == "Not Sure" for field in LABEL_FIELDS)
+
+
+@task(name="load-cached-classifications", tags=["classification-db"])
+def load_cached_classifications(keys: list[str]) -> dict[str, dict]:
+    """Return labels stored by earlier runs for the given content keys."""
+    logger = get_run_logger()
+
+    session = get_db_session()
+    try:
+        cached: dict[str, dict] = {}
+        for start in range(0, len(keys), CACHE_LOOKUP_CHUNK_SIZE):
+            chunk = keys[start : start + CACHE_LOOKUP_CHUNK_SIZE]
+            rows = session.execute(
+                select(ArticleClassificationCache).where(
+                    ArticleClassificationCache.content_sha256.in_(chunk)
+                )
+            ).scalars()
+            for row in rows:
+                cached[row.content_sha256] = {
+                    field: getattr(row, field) for field in LABEL_FIELDS
+                }
+    finally:
+        session.close()
+
+    logger.info("Found %d/%d classifications in cache", len(cached), len(keys))
+    return cached
+
+
+@task(name="save-cached-classifications", tags=["classification-db"])
+def save_cached_classifications(entries: list[dict]) -> None:
+    """Store new classifications so identical bodies in later runs reuse them."""
+    logger = get_run_logger()
+
+    session = get_db_session()
+    try:
+        session.execute(
+            pg_insert(ArticleClassificationCache)
+            .values(entries)
+            .on_conflict_do_nothing(
+                index_elements=[ArticleClassificationCache.content_sha256]
+            )
         )
-        return articles
+        session.commit()
+        logger.info("Cached %d new classifications", len(entries))
+    except Exception:
+        session.rollback()
+        raise
     finally:
         session.close()
 
 
-@task(name="classify-article", tags=["LLM_CALLS"], retries=3, retry_delay_seconds=2)
-def classify_article(article_row: dict) -> dict:
+def _classification_row(article_id: int, classification: ArticleClassification) -> dict:
+    return {
+        "article_id": article_id,
+        "active_campaign": classification.active_campaign,
+        "cve": classification.cve,
+        "digest": classification.digest,
+    }
+
+
+def _is_retryable_llm_error(exc: BaseException) -> bool:
+    """Rate limiting, server and transport errors are retried, as are responses
+    that fail to parse; other 4xx fail the same way every time. Cancellation
+    and interrupts propagate immediately."""
+    if isinstance(exc, errors.ClientError):
+        return exc.code == 429
+    return isinstance(exc, (errors.ServerError, *TRANSPORT_ERRORS, ValueError))
+
+
+@retry(
+    retry=retry_if_exception(_is_retryable_llm_error),
+    wait=wait_exponential_jitter(initial=1, max=30),
+    stop=stop_after_attempt(6),
+    reraise=True,
+)
+async def _classify_one(
+    client: AsyncClient, article_row: dict, model: str = CLASSIFY_MODEL
+) -> dict:
     """Call the LLM to classify a single article and return the result."""
     logger = get_run_logger()
     article_url = article_row["url"]
     article_text = article_row["text"]
 
     try:
-        response = client.models.generate_content(
-            # model="gemini-3-pro-preview",
-            model="gemini-2.5-pro",
+        await rate_limit(LLM_RATE_LIMIT)
+        response = await client.models.generate_content(
+            model=model,
             contents=article_text,
             config=types.GenerateContentConfig(
                 response_mime_type="application/json",
@@ -79,70 +210,166 @@ def classify_article(article_row: dict) -> dict:
                 system_instruction=ATTACK_CLASSIFICATION_PROMPT,
             ),
         )
-        classification = json.loads(response.text)
+        classification = response.parsed
+        if not isinstance(classification, ArticleClassification):
+            classification = ArticleClassification.model_validate_json(response.text)
         logger.info(
             "Article %s classified - active_campaign=%s cve=%s digest=%s",
             article_row["id"],
-            classification["active_campaign"],
-            classification["cve"],
-            classification["digest"],
+            classification.active_campaign,
+            classification.cve,
+            classification.digest,
         )
-        return {
-            "article_id": article_row["id"],
-            "active_campaign": classification["active_campaign"],
-            "cve": classification["cve"],
-            "digest": classification["digest"],
-        }
+        return _classification_row(article_row["id"], classification)
 
     except Exception as exc:
         logger.error("Error classifying article %s: %s", article_url, exc)
         raise
 
 
-@task(name="save-classification-to-db", tags=["classification-db"])
-def save_classification_to_db(result: dict) -> None:
-    """Persist a single classification result to article_classification_labels."""
+async def _classify_batch(client: AsyncClient, article_rows: list[dict]) -> list[dict]:
+    """Classify several articles in one LLM request.
+
+    Raises ValueError when the response does not contain exactly one
+    classification per input article.
+    """
+    logger = get_run_logger()
+    contents = json.dumps(
+        [{"id": row["id"], "text": row["text"]} for row in article_rows]
+    )
+
+    await rate_limit(LLM_RATE_LIMIT)
+    response = await client.models.generate_content(
+        model=CLASSIFY_MODEL,
+        contents=contents,
+        config=types.GenerateContentConfig(
+            response_mime_type="application/json",
+            response_schema=list[ArticleClassificationItem],
+            system_instruction=CLASSIFY_BATCH_PROMPT,
+        ),
+    )
+    items = response.parsed
+    if not isinstance(items, list):
+        items = CLASSIFICATION_ITEMS.validate_json(response.text)
+
+    by_id = {item.article_id: item for item in items}
+    expected_ids = [row["id"] for row in article_rows]
+    if len(items) != len(article_rows) or set(by_id) != set(expected_ids):
+        raise ValueError(
+            f"Expected classifications for {expected_ids}, got {sorted(by_id)}"
+        )
+
+    logger.info("Classified batch of %d articles: %s", len(items), expected_ids)
+    return [
+        _classification_row(article_id, by_id[article_id])
+        for article_id in expected_ids
+    ]
+
+
+@task(name="classify-articles", tags=["LLM_CALLS"])
+async def classify_articles(articles: list[dict]) -> list[dict | BaseException]:
+    """Classify a chunk of articles concurrently on one event loop.
+
+    Articles are sent CLASSIFY_BATCH_SIZE per request; a batch whose response
+    is unusable is retried one article per request. Articles the first-pass
+    model is unsure about are classified again by the fallback model; if that
+    fails, the first-pass row is kept and flagged with fallback_failed. Returns
+    one entry per input article: its classification, or the exception it
+    still failed with after retries.
+    """
     logger = get_run_logger()
-    session = get_db_session()
-    try:
-        session.add(
-            ArticleClassificationLabel(
-                article_id=result["article_id"],
-                active_campaign=result["active_campaign"],
-                cve=result["cve"],
-                digest=result["digest"],
-                label_source="llm",
+    semaphore = asyncio.Semaphore(CLASSIFY_CONCURRENCY)
+    client = _async_client()
+
+    async def classify_single(article: dict, model: str = CLASSIFY_MODEL) -> dict:
+        async with semaphore:
+            return await _classify_one(client, article, model)
+
+    async def recheck(article: dict, row: dict | BaseException) -> dict | BaseException:
+        if isinstance(row, BaseException) or not _is_unsure(row):
+            return row
+        try:
+            return await classify_single(article, CLASSIFY_FALLBACK_MODEL)
+        except Exception as exc:
+            logger.warning(
+                "Fallback classification failed for article %s, keeping first "
+                "pass: %s",
+                article["id"],
+                exc,
+            )
+            # Saved as labels, but not cached so a later run asks again
+            return {**row, "fallback_failed": True}
+
+    async def classify(batch: list[dict]) -> list[dict | BaseException]:
+        try:
+            async with semaphore:
+                rows = await _classify_batch(client, batch)
+        except Exception as exc:
+            logger.warning(
+                "Batch classification failed, retrying per article: %s", exc
+            )
+            rows = await asyncio.gather(
+                *(classify_single(article) for article in batch),
+                return_exceptions=True,
             )
+        return await asyncio.gather(
+            *(recheck(article, row) for article, row in zip(batch, rows))
         )
-        session.commit()
-        logger.info("Saved classification for article %s", result["article_id"])
+
+    batches = [
+        articles[start : start + CLASSIFY_BATCH_SIZE]
+        for start in range(0, len(articles), CLASSIFY_BATCH_SIZE)
+    ]
+    try:
+        results = await asyncio.gather(*(classify(batch) for batch in batches))
+    finally:
+        await client.aclose()
+    return [result for batch_results in results for result in batch_results]
+
+
+@task(name="save-classifications-to-db", tags=["classification-db"])
+async def save_classifications_to_db(results: list[dict]) -> None:
+    """Persist a batch of classification results to article_classification_labels."""
+    logger = get_run_logger()
+    session = get_async_db_session()
+    try:
+        await session.execute(
+            insert(ArticleClassificationLabel),
+            [{**result, "label_source": "llm"} for result in results],
+        )
+        await session.commit()
+        logger.info("Saved %d classifications", len(results))
     except Exception:
-        session.rollback()
+        await session.rollback()
         raise
     finally:
-        session.close()
+        await session.close()
 
 
-@task(name="save-error-to-log", tags=["classification-db"])
-def save_error_to_log(error: dict) -> None:
-    """Persist a single classification error to source_error_log."""
+@task(name="save-errors-to-log", tags=["classification-db"])
+def save_errors_to_log(errors: list[dict]) -> None:
+    """Persist a batch of classification errors to source_error_log."""
     logger = get_run_logger()
     session = get_db_session()
     try:
         now = datetime.now(tz=timezone.utc)
-        session.add(
-            SourceErrorLog(
-                source_uuid=str(error["article_id"]),
-                source_url=error["url"],
-                status_code="CLASSIFICATION_ERROR",
-                error_message=error["error_message"],
-                process=FLOW_NAME,
-                detected_at=now,
-                created_at=now,
-            )
+        session.execute(
+            insert(SourceErrorLog),
+            [
+                {
+                    "source_uuid": str(error["article_id"]),
+                    "source_url": error["url"],
+                    "status_code": "CLASSIFICATION_ERROR",
+                    "error_message": error["error_message"],
+                    "process": FLOW_NAME,
+                    "detected_at": now,
+                    "created_at": now,
+                }
+                for error in errors
+            ],
         )
         session.commit()
-        logger.info("Logged error for article %s", error["article_id"])
+        logger.info("Logged %d classification errors", len(errors))
     except Exception:
         session.rollback()
         raise
@@ -157,8 +384,11 @@ def save_error_to_log(error: dict) -> None:
 def run() -> None:
     """Classify unclassified articles from the DB and persist to article_classification_labels.
 
-    Concurrency for LLM calls is controlled by Prefect concurrency limits on the
-    'classification-llm' tag (configure in the Prefect UI or via CLI).
+    Articles are classified in chunks, each chunk running up to
+    CLASSIFY_CONCURRENCY LLM calls at once; how many chunks run in parallel is
+    controlled by Prefect concurrency limits on the 'LLM_CALLS' tag. Request
+    rate is paced by the 'gemini-requests' global concurrency limit when it exists.
+    Articles whose body was already classified reuse the stored labels.
     """
     logger = get_run_logger()
 
@@ -167,33 +397,94 @@ def run() -> None:
         logger.warning("No articles to classify; exiting")
         return
 
-    futures = [(article, classify_article.submit(article)) for article in articles]
+    # Similar-length articles share chunks and batches, so one very long
+    # article does not hold back requests made up of short ones
+    articles.sort(key=lambda article: len(article["text"]))
 
+    # Identical bodies (syndicated copies, re-scrapes) are sent to the LLM
+    # once, and bodies classified by earlier runs reuse the stored labels
+    keys = {article["id"]: _classification_key(article["text"]) for article in articles}
+    cached = load_cached_classifications(sorted(set(keys.values())))
+    duplicates: dict[str, list[dict]] = {}
+    to_classify: list[dict] = []
+    pending: list[dict] = []
+    for article in articles:
+        key = keys[article["id"]]
+        if key in cached:
+            pending.append({"article_id": article["id"], **cached[key]})
+        elif key in duplicates:
+            duplicates[key].append(article)
+        else:
+            duplicates[key] = []
+            to_classify.append(article)
+    logger.info(
+        "%d articles reuse cached labels, %d need the LLM",
+        len(pending),
+        len(to_classify),
+    )
+
+    # Collect chunks as they complete so a slow LLM call does not hold back
+    # persisting the classifications that already finished; rows are written
+    # in batches, in the background while classification continues.
+    chunks = [
+        to_classify[start : start + CLASSIFY_CHUNK_SIZE]
+        for start in range(0, len(to_classify), CLASSIFY_CHUNK_SIZE)
+    ]
+    futures = {classify_articles.submit(chunk): chunk for chunk in chunks}
+
+    errors: list[dict] = []
+    new_cache_entries: list[dict] = []
+    save_futures = []
     saved_count = 0
-    error_count = 0
-    for article, future in futures:
-        result = future.result(raise_on_failure=False)
-        if isinstance(result, Exception):
-            logger.error(
-                "Classification failed for article %s: %s", article["id"], result
+    for future in as_completed(list(futures)):
+        chunk = futures[future]
+        outcome = future.result(raise_on_failure=False)
+        results = [outcome] * len(chunk) if isinstance(outcome, Exception) else outcome
+        for article, result in zip(chunk, results):
+            key = keys[article["id"]]
+            if isinstance(result, BaseException):
+                for failed in (article, *duplicates[key]):
+                    logger.error(
+                        "Classification failed for article %s: %s",
+                        failed["id"],
+                        result,
+                    )
+                    errors.append(
+                        {
+                            "article_id": failed["id"],
+                            "url": failed["url"],
+                            "error_message": str(result),
+                        }
+                    )
+                continue
+            if not result.pop("fallback_failed", False):
+                labels = {field: result[field] for field in LABEL_FIELDS}
+                new_cache_entries.append({"content_sha256": key, **labels})
+            pending.append(result)
+            pending.extend(
+                {**result, "article_id": duplicate["id"]}
+                for duplicate in duplicates[key]
             )
-            save_error_to_log(
-                {
-                    "article_id": article["id"],
-                    "url": article["url"],
-                    "error_message": str(result),
-                }
-            )
-            error_count += 1
-        else:
-            save_classification_to_db(result)
-            saved_count += 1
+            if len(pending) >= SAVE_BATCH_SIZE:
+                save_futures.append(save_classifications_to_db.submit(pending))
+                saved_count += len(pending)
+                pending = []
+
+    if pending:
+        save_futures.append(save_classifications_to_db.submit(pending))
+        saved_count += len(pending)
+    if errors:
+        save_errors_to_log(errors)
+    if new_cache_entries:
+        save_cached_classifications(new_cache_entries)
+    for save_future in save_futures:
+        save_future.result()
 
     logger.info(
         "Classification done: %d/%d succeeded, %d errors",
         saved_count,
         len(articles),
-        error_count,
+        len(errors),
     )
 
 
@@ -17,7 +17,17 @@ QUERY_SOURCES = """
     ORDER BY count(*) DESC
 """
 
+QUERY_SOURCES_FILTERED = """
+    SELECT s.source_name, count(*) AS article_count
+    FROM extracted_article_urls u
+    JOIN sources_master_list s ON u.source_uuid = s.source_uuid
+    WHERE s.source_name ILIKE :q
+    GROUP BY s.source_uuid, s.source_name
+    ORDER BY count(*) DESC
+"""
+
 
+@st.cache_resource
 def get_engine():
     database_url = os.getenv("DATABASE_URL", "")
     if not database_url:
@@ -25,6 +35,10 @@ def get_engine():
     sync_url = database_url.replace("postgresql+asyncpg://", "postgresql://")
     return create_engine(
         sync_url,
+        pool_size=2,
+        max_overflow=2,
+        pool_pre_ping=True,
+        pool_recycle=1800,
         connect_args={"sslmode": "prefer", "gssencmode": "disable"},
     )
 
@@ -36,6 +50,16 @@ def fetch_sources() -> pd.DataFrame:
         return pd.read_sql(text(QUERY_SOURCES), conn)
 
 
+@st.cache_data(ttl=60)
+def fetch_sources_filtered(search: str) -> pd.DataFrame:
+    engine = get_engine()
+    escaped = search.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    with engine.connect() as conn:
+        return pd.read_sql(
+            text(QUERY_SOURCES_FILTERED), conn, params={"q": f"%{escaped}%"}
+        )
+
+
 def main() -> None:
     st.set_page_config(page_title="Threat Intel Dashboard", layout="wide")
     st.title("Threat Intel Dashboard")
@@ -56,13 +80,17 @@ def main() -> None:
         st.write("")
         if st.button("Refresh"):
             fetch_sources.clear()
+            fetch_sources_filtered.clear()
             st.rerun()
 
-    filtered = (
-        df[df["source_name"].str.contains(search, case=False, na=False)]
-        if search
-        else df
-    )
+    if search:
+        try:
+            filtered = fetch_sources_filtered(search)
+        except Exception as exc:
+            st.error(f"Failed to filter sources: {exc}")
+            return
+    else:
+        filtered = df
 
     st.dataframe(
         filtered,